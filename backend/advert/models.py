@@ -49,6 +49,7 @@ class Advert(models.Model):
             user=self.creator,
             activity_type=activity_type,
             details=f'Advert "{self.title}" {"created" if is_new else "updated"}',
+            target=self,
             status='success'
         )
     
@@ -58,6 +59,8 @@ class Advert(models.Model):
             user=self.creator,
             activity_type='advert_deleted',
             details=f'Advert "{self.title}" deleted',
+            target=self,
+            payload={'title': self.title},
             status='success'
         )
         super().delete(*args, **kwargs)
\ No newline at end of file
@@ -8,6 +8,7 @@ from django.db.models import Q
 from .models import Advert
 from .serializers import AdvertSerializer
 from users.models import UserActivity
+from users.serializers import UserActivitySerializer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -86,17 +87,15 @@ class AdvertViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def activity(self, request, pk=None):
         advert = self.get_object()
-        activities = UserActivity.objects.filter(
-            Q(activity_type='advert_created') |
-            Q(activity_type='advert_updated') |
-            Q(activity_type='advert_deleted'),
-            details__contains=advert.title
-        ).order_by('-created_at')
+        # Indexed lookup on (content_type, object_id, timestamp)
+        activities = UserActivity.objects.for_object(advert).filter(
+            activity_type__in=['advert_created', 'advert_updated', 'advert_deleted']
+        ).select_related('user').order_by('-timestamp', '-id')
         
         page = self.paginate_queryset(activities)
         if page is not None:
-            serializer = AdvertActivitySerializer(page, many=True)
+            serializer = UserActivitySerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = AdvertActivitySerializer(activities, many=True)
+        serializer = UserActivitySerializer(activities, many=True)
         return Response(serializer.data)
\ No newline at end of file
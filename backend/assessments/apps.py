@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class AssessmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assessments'
+
+    def ready(self):
+        from django.db.models import Q
+        from courses.models import visible_course_rows
+        from filestore.access import register_blob_access
+        from .models import AssessmentAttachment
+        register_blob_access(
+            AssessmentAttachment,
+            lambda queryset, user: visible_course_rows(queryset, user, 'assessment__course')
+            | queryset.filter(created_by=user)
+        )
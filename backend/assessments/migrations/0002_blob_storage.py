@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-19 11:02
+
+import assessments.models
+import filestore.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assessmentattachment',
+            name='file',
+            field=models.FileField(storage=filestore.storage.blob_storage, upload_to=assessments.models.assessment_file_path),
+        ),
+    ]
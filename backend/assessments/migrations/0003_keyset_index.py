@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_blob_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentsubmission',
+            index=models.Index(fields=['-created_at', '-id'], name='assessments_created_ce5db4_idx'),
+        ),
+    ]
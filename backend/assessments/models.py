@@ -1,5 +1,6 @@
 # assessments/models.py
 from django.db import models
+from filestore.storage import blob_storage
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -179,7 +180,7 @@ class AssessmentAttachment(models.Model):
         on_delete=models.CASCADE, 
         related_name='attachments'
     )
-    file = models.FileField(upload_to=assessment_file_path)
+    file = models.FileField(upload_to=assessment_file_path, storage=blob_storage)
     name = models.CharField(max_length=200, blank=True)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -242,6 +243,9 @@ class AssessmentSubmission(models.Model):
     class Meta:
         unique_together = ['assessment', 'user', 'attempt_number']
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.assessment} (Attempt {self.attempt_number})"
@@ -49,8 +49,8 @@
 #         source='course',
 #         write_only=True
 #     )
-#     created_by = UserSerializer(read_only=True)
-#     edited_by = UserSerializer(read_only=True)
+#     created_by = UserSummarySerializer(read_only=True)
+#     edited_by = UserSummarySerializer(read_only=True)
 #     status_display = serializers.CharField(source='get_status_display', read_only=True)
 #     assessment_type_display = serializers.CharField(
 #         source='get_assessment_type_display', 
@@ -196,8 +196,8 @@
 
 # class AssessmentSubmissionSerializer(serializers.ModelSerializer):
 #     responses = QuestionResponseSerializer(many=True, required=False)
-#     user = UserSerializer(read_only=True)
-#     graded_by = UserSerializer(read_only=True)
+#     user = UserSummarySerializer(read_only=True)
+#     graded_by = UserSummarySerializer(read_only=True)
 #     status_display = serializers.CharField(source='get_status_display', read_only=True)
 #     is_passed = serializers.BooleanField(read_only=True)
 #     is_late = serializers.BooleanField(read_only=True)
@@ -325,7 +325,7 @@ from .models import (
     QuestionResponse, RubricRating
 )
 from courses.serializers import CourseSerializer
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer
 
 class QuestionOptionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -398,8 +398,8 @@ class AssessmentSerializer(serializers.ModelSerializer):
         source='course',
         write_only=True
     )
-    created_by = UserSerializer(read_only=True)
-    edited_by = UserSerializer(read_only=True)
+    created_by = UserSummarySerializer(read_only=True)
+    edited_by = UserSummarySerializer(read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     assessment_type_display = serializers.CharField(
         source='get_assessment_type_display', 
@@ -507,8 +507,8 @@ class QuestionResponseSerializer(serializers.ModelSerializer):
 
 class AssessmentSubmissionSerializer(serializers.ModelSerializer):
     responses = QuestionResponseSerializer(many=True, required=False)
-    user = UserSerializer(read_only=True)
-    graded_by = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
+    graded_by = UserSummarySerializer(read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     is_passed = serializers.BooleanField(read_only=True)
     is_late = serializers.BooleanField(read_only=True)
@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from lms_admin.pagination import KeysetPagination
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count, Avg
@@ -17,6 +18,7 @@ from .serializers import (
 )
 from courses.models import Course
 from users.models import User
+from users.serializers import with_user_summaries
 
 class AssessmentViewSet(viewsets.ModelViewSet):
     queryset = Assessment.objects.all()
@@ -82,7 +84,7 @@ class AssessmentViewSet(viewsets.ModelViewSet):
                 Q(course__course_instructors__instructor__user=self.request.user)
             ).distinct()
         
-        return queryset.select_related('course', 'created_by', 'edited_by').prefetch_related('questions', 'rubrics', 'attachments')
+        return with_user_summaries(queryset.select_related('course'), 'created_by', 'edited_by').prefetch_related('questions', 'rubrics', 'attachments')
     
     def check_permissions(self, request):
         super().check_permissions(request)
@@ -369,6 +371,8 @@ class AssessmentSubmissionViewSet(viewsets.ModelViewSet):
     queryset = AssessmentSubmission.objects.all()
     serializer_class = AssessmentSubmissionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -383,8 +387,8 @@ class AssessmentSubmissionViewSet(viewsets.ModelViewSet):
         elif not (self.request.user.is_staff or self.request.user.is_superuser) and not self.is_course_instructor():
             queryset = queryset.filter(user=self.request.user)
         
-        return queryset.select_related(
-            'assessment', 'user', 'graded_by'
+        return with_user_summaries(
+            queryset.select_related('assessment'), 'user', 'graded_by'
         ).prefetch_related('responses', 'responses__selected_options')
     
     def is_course_instructor(self):
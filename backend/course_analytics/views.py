@@ -7,6 +7,7 @@ from .serializers import UserProgressSerializer, QuizResultSerializer, CourseAna
 from courses.models import Course, Enrollment
 from django.db.models import Count, Avg, Sum
 from rest_framework.pagination import PageNumberPagination
+from metrics.counts import APPROX, register_count, read_counts, wants_exact
 
 class StandardResultsPagination(PageNumberPagination):
     page_size = 10
@@ -70,13 +71,19 @@ class CourseAnalyticsView(APIView):
             serializer = CourseAnalyticsSerializer(page, many=True)
             return paginator.get_paginated_response(serializer.data)
 
+DASHBOARD_COUNTS = [
+    register_count('courses.total', lambda: Course.objects.all()),
+    register_count('enrollments.total', lambda: Enrollment.objects.all(), mode=APPROX),
+]
+
 class DashboardAnalyticsView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
+        counts = read_counts(DASHBOARD_COUNTS, exact=wants_exact(request))
         data = {
-            'total_courses': Course.objects.count(),
-            'total_enrollments': Enrollment.objects.count(),
+            'total_courses': counts['courses.total'],
+            'total_enrollments': counts['enrollments.total'],
             'average_completion_rate': CourseAnalytics.objects.aggregate(avg=Avg('completion_rate'))['avg'] or 0,
             'average_rating': CourseAnalytics.objects.aggregate(avg=Avg('average_rating'))['avg'] or 0,
             'top_courses': CourseAnalytics.objects.order_by('-total_enrollments')[:5].values(
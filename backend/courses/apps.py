@@ -5,4 +5,8 @@ class CoursesConfig(AppConfig):
     name = 'courses'
 
     def ready(self):
-        import courses.signals  # Load signals
\ No newline at end of file
+        import courses.signals  # Load signals
+        from filestore.access import register_blob_access
+        from .models import Lesson, Resource, visible_course_rows
+        register_blob_access(Lesson, lambda queryset, user: visible_course_rows(queryset, user, 'module__course'))
+        register_blob_access(Resource, visible_course_rows)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 11:02
+
+import courses.models
+import filestore.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_faq'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lesson',
+            name='content_file',
+            field=models.FileField(blank=True, null=True, storage=filestore.storage.blob_storage, upload_to='lessons/files/'),
+        ),
+        migrations.AlterField(
+            model_name='resource',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=filestore.storage.blob_storage, upload_to=courses.models.resource_file_path),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_blob_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-enrolled_at', '-id'], name='courses_enr_enrolle_9b4db2_idx'),
+        ),
+    ]
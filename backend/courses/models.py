@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from filestore.storage import blob_storage
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.text import slugify
@@ -140,7 +142,7 @@ class Lesson(models.Model):
     lesson_type = models.CharField(max_length=20, choices=LESSON_TYPE_CHOICES, default='video')
     duration = models.CharField(max_length=20, help_text="Duration in minutes", default= "1 hour")
     content_url = models.URLField(blank=True)
-    content_file = models.FileField(upload_to='lessons/files/', blank=True, null=True)
+    content_file = models.FileField(upload_to='lessons/files/', storage=blob_storage, blank=True, null=True)
     order = models.PositiveIntegerField(default=0)
     is_published = models.BooleanField(default=True)
     
@@ -171,7 +173,7 @@ class Resource(models.Model):
     title = models.CharField(max_length=200)
     resource_type = models.CharField(max_length=20, choices=RESOURCE_TYPE_CHOICES)
     url = models.URLField(blank=True)
-    file = models.FileField(upload_to=resource_file_path, blank=True, null=True)
+    file = models.FileField(upload_to=resource_file_path, storage=blob_storage, blank=True, null=True)
     order = models.PositiveIntegerField(default=0)
     
     class Meta:
@@ -281,6 +283,9 @@ class Enrollment(models.Model):
     
     class Meta:
         unique_together = ['user', 'course']
+        indexes = [
+            models.Index(fields=['-enrolled_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.user} - {self.course}"
@@ -372,4 +377,13 @@ class FAQ(models.Model):
         verbose_name_plural = 'FAQs'
 
     def __str__(self):
-        return f"{self.course.title} - {self.question[:50]}..."
\ No newline at end of file
+        return f"{self.course.title} - {self.question[:50]}..."
+
+
+def visible_course_rows(queryset, user, course_path='course'):
+    """Rows of ``queryset`` whose course (reached via ``course_path``) the user created, teaches or is enrolled in."""
+    return queryset.filter(
+        Q(**{f'{course_path}__created_by': user})
+        | Q(**{f'{course_path}__course_instructors__instructor__user': user})
+        | Q(**{f'{course_path}__enrollments__user': user, f'{course_path}__enrollments__is_active': True})
+    )
@@ -6,7 +6,7 @@ from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework import viewsets
 from django.db import transaction
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, ValidationError
 from users.models import UserActivity
 from rest_framework import serializers
 from django.db import models
@@ -23,6 +23,8 @@ from .serializers import (CategorySerializer, CourseSerializer,BulkEnrollmentSer
     LearningPathSerializer, EnrollmentSerializer, CertificateSerializer, CourseRatingSerializer
 )
 from rest_framework.pagination import PageNumberPagination
+from lms_admin.pagination import KeysetPagination
+from metrics.counts import register_count, read_counts, wants_exact
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 import logging
@@ -62,6 +64,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='category_created',
                 details=f'Category "{serializer.data["name"]}" created',
+                target=serializer.instance,
                 status='success'
             )
             
@@ -96,6 +99,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='course_updated',
                 details=f'Course "{instance.title}" updated. Changes: {"; ".join(changes)}',
+                target=instance,
+                payload={'changes': changes},
                 status='success'
             )
             
@@ -110,6 +115,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='category_deleted',
                 details=f'Category "{instance.name}" deleted',
+                target=instance,
+                payload={'name': instance.name},
                 status='success'
             )
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -142,6 +149,7 @@ class CourseViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='course_created',
                 details=f'Course "{serializer.data["title"]}" created',
+                target=serializer.instance,
                 status='success'
             )
             
@@ -165,6 +173,7 @@ class CourseViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='course_updated',
                 details=f'Course "{instance.title}" updated',
+                target=instance,
                 status='success'
             )
             
@@ -179,6 +188,8 @@ class CourseViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='course_deleted',
                 details=f'Course "{instance.title}" deleted',
+                target=instance,
+                payload={'title': instance.title},
                 status='success'
             )
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -483,6 +494,7 @@ class StandardResultsPagination(PageNumberPagination):
 class EnrollmentViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsPagination
+    keyset_ordering = ('-enrolled_at', '-id')
 
     def list(self, request, course_id=None, user_id=None):
         try:
@@ -514,6 +526,8 @@ class EnrollmentViewSet(viewsets.ViewSet):
             page = paginator.paginate_queryset(enrollments, request)
             serializer = EnrollmentSerializer(page, many=True)
             return paginator.get_paginated_response(serializer.data)
+        except APIException:
+            raise
         except Exception as e:
             logger.error(f"Error in EnrollmentView GET: {str(e)}", exc_info=True)
             return Response(
@@ -613,13 +627,17 @@ class EnrollmentViewSet(viewsets.ViewSet):
         try:
             enrollments = Enrollment.objects.filter(
                 is_active=True
-            ).select_related('user', 'course').order_by('-enrolled_at')
+            ).select_related('user', 'course')
             
-            paginator = self.pagination_class()
-            page = paginator.paginate_queryset(enrollments, request)
+            # Keyset pages: this table only grows, OFFSET scans get slower with depth
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(enrollments, request, view=self)
             serializer = EnrollmentSerializer(page, many=True)
             return paginator.get_paginated_response(serializer.data)
             
+        except APIException:
+            # e.g. NotFound for a bad ?cursor=; let DRF render it
+            raise
         except Exception as e:
             logger.error(f"Error fetching all enrollments: {str(e)}", exc_info=True)
             return Response(
@@ -936,6 +954,11 @@ class UserBadgeViewSet(ModelViewSet):
             return UserBadge.objects.all()
         return UserBadge.objects.filter(user=self.request.user)
     
+FAQ_STAT_COUNTS = [
+    register_count('faqs.total', lambda: FAQ.objects.all()),
+    register_count('faqs.active', lambda: FAQ.objects.filter(is_active=True)),
+]
+
 class FAQViewSet(viewsets.ModelViewSet):
     serializer_class = FAQSerializer
     permission_classes = [IsAuthenticated]
@@ -966,8 +989,9 @@ class FAQViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        total_faqs = FAQ.objects.count()
-        active_faqs = FAQ.objects.filter(is_active=True).count()
+        counts = read_counts(FAQ_STAT_COUNTS, exact=wants_exact(request))
+        total_faqs = counts['faqs.total']
+        active_faqs = counts['faqs.active']
         return Response({
             'total_faqs': total_faqs,
             'active_faqs': active_faqs,
@@ -0,0 +1,32 @@
+# filestore/access.py
+"""
+Who may download a blob.
+
+A blob has no owner of its own: a user may read it when they can see at
+least one row that references it. Each app registers, per model, a
+function narrowing that model's queryset to the rows a user can see
+(register_blob_access, called from AppConfig.ready). Rows of models that
+never registered are only served to staff.
+"""
+from django.db.models import Q
+
+from .signals import _blob_fields
+
+_visible_rows = {}
+
+
+def register_blob_access(model, visible):
+    """``visible(queryset, user)`` returns the rows of ``queryset`` the user can see."""
+    _visible_rows[model] = visible
+
+
+def can_read_blob(user, blob):
+    if user.is_staff or user.is_superuser:
+        return True
+    for model, visible in _visible_rows.items():
+        references = Q()
+        for field in _blob_fields(model):
+            references |= Q(**{field.name: blob.name})
+        if visible(model.objects.filter(references), user).exists():
+            return True
+    return False
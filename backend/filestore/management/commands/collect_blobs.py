@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from filestore.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed blobs that are no longer referenced'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help='Keep unreferenced blobs younger than this (default 24)'
+        )
+
+    def handle(self, *args, **options):
+        removed = collect_garbage(grace=timedelta(hours=options['grace_hours']))
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} unreferenced blob(s)'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 11:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filestore', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blob',
+            name='filestore_b_ref_cou_201a56_idx',
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='last_referenced_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='blob',
+            index=models.Index(fields=['ref_count', 'last_referenced_at'], name='filestore_b_ref_cou_c8b473_idx'),
+        ),
+    ]
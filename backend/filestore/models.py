@@ -0,0 +1,29 @@
+# filestore/models.py
+from django.db import models
+from django.utils import timezone
+
+
+class Blob(models.Model):
+    """
+    One stored file per distinct content. Rows in other apps point at the
+    blob through a FileField using ContentAddressedStorage; ``ref_count``
+    tracks how many of those rows exist so unreferenced blobs can be
+    garbage collected.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Start of the garbage-collection grace period: bumped on every upload
+    # of this content and on every reference change
+    last_referenced_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['ref_count', 'last_referenced_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
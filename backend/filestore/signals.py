@@ -0,0 +1,56 @@
+# filestore/signals.py
+from django.apps import apps
+from django.db.models import FileField
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .storage import ContentAddressedStorage, release_blobs, retain_blobs
+
+
+def _blob_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def _current_names(instance, fields):
+    names = {}
+    for field in fields:
+        if field.attname in instance.__dict__:
+            value = getattr(instance, field.attname)
+            names[field.attname] = value.name if value else None
+    return names
+
+
+def _make_receivers(fields):
+    def remember_names(sender, instance, **kwargs):
+        instance._blob_names = _current_names(instance, fields)
+
+    def track_save(sender, instance, **kwargs):
+        previous = getattr(instance, '_blob_names', {})
+        current = _current_names(instance, fields)
+        retain_blobs(name for attname, name in current.items() if previous.get(attname) != name)
+        release_blobs(previous.get(attname) for attname, name in current.items() if previous.get(attname) != name)
+        instance._blob_names = current
+
+    def track_delete(sender, instance, **kwargs):
+        release_blobs(_current_names(instance, fields).values())
+
+    return remember_names, track_save, track_delete
+
+
+def connect_blob_tracking():
+    """
+    Keep Blob.ref_count in step with every model whose FileFields use
+    ContentAddressedStorage. bulk_create/bulk delete bypass these signals;
+    callers use retain_blobs/release_blobs directly in that case.
+    """
+    for model in apps.get_models():
+        fields = _blob_fields(model)
+        if not fields:
+            continue
+        remember_names, track_save, track_delete = _make_receivers(fields)
+        uid = f'filestore_{model._meta.label_lower}'
+        post_init.connect(remember_names, sender=model, weak=False, dispatch_uid=uid)
+        post_save.connect(track_save, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(track_delete, sender=model, weak=False, dispatch_uid=uid)
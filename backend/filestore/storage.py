@@ -0,0 +1,140 @@
+# filestore/storage.py
+import hashlib
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+CHUNK_SIZE = 64 * 1024
+BLOB_PREFIX = 'blobs'
+
+
+def blob_path(digest, extension=''):
+    """blobs/ab/cd/abcd...<ext> - fan out so no directory grows unbounded."""
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+def hash_content(content):
+    """SHA-256 of a Django File, read in chunks and rewound afterwards."""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names files after their SHA-256 digest.
+    Saving content that is already stored returns the existing name
+    instead of writing a second copy. Uploads that went through
+    filestore.uploadhandlers arrive with ``sha256`` already computed.
+    """
+
+    def _save(self, name, content):
+        from .models import Blob
+
+        digest = getattr(content, 'sha256', None) or hash_content(content)
+        with transaction.atomic():
+            # The row lock orders this save against collect_garbage(), and the
+            # touch restarts the grace period before the referencing row's
+            # post_save takes its reference
+            blob = Blob.objects.select_for_update().filter(sha256=digest).first()
+            if blob and self.exists(blob.name):
+                Blob.objects.filter(pk=blob.pk).update(last_referenced_at=timezone.now())
+                return blob.name
+
+            extension = os.path.splitext(name)[1].lower()[:16]
+            stored_name = self._write(blob_path(digest, extension), content)
+            size = content.size if content.size is not None else self.size(stored_name)
+            if blob:
+                # Row survived but the file went missing: point it at the new copy
+                Blob.objects.filter(pk=blob.pk).update(
+                    name=stored_name, size=size, last_referenced_at=timezone.now()
+                )
+                return stored_name
+            try:
+                with transaction.atomic():
+                    Blob.objects.create(sha256=digest, name=stored_name, size=size)
+            except IntegrityError:
+                # A concurrent first upload of the same content created the row
+                blob = Blob.objects.select_for_update().get(sha256=digest)
+                Blob.objects.filter(pk=blob.pk).update(last_referenced_at=timezone.now())
+                return blob.name
+        return stored_name
+
+    def _write(self, stored_name, content):
+        """
+        Write content at its digest-derived name. When a concurrent upload got
+        there first, FileSystemStorage picks a suffixed name; the bytes are
+        identical, so drop that copy and keep the canonical one.
+        """
+        if self.exists(stored_name):
+            return stored_name
+        written = super()._save(stored_name, content)
+        if written != stored_name:
+            self.delete(written)
+        return stored_name
+
+
+_blob_storage = None
+
+
+def blob_storage():
+    """Storage callable used by FileFields (keeps migrations free of instances)."""
+    global _blob_storage
+    if _blob_storage is None:
+        _blob_storage = ContentAddressedStorage()
+    return _blob_storage
+
+
+def retain_blobs(names):
+    """Add one reference per occurrence of each stored name (for bulk_create callers)."""
+    from .models import Blob
+
+    now = timezone.now()
+    for name, count in Counter(n for n in names if n).items():
+        Blob.objects.filter(name=name).update(ref_count=F('ref_count') + count, last_referenced_at=now)
+
+
+def release_blobs(names):
+    from .models import Blob
+
+    now = timezone.now()
+    for name, count in Counter(n for n in names if n).items():
+        blob = Blob.objects.filter(name=name)
+        blob.filter(ref_count__gte=count).update(ref_count=F('ref_count') - count, last_referenced_at=now)
+        blob.filter(ref_count__lt=count).update(ref_count=0, last_referenced_at=now)
+
+
+def collect_garbage(grace=timedelta(hours=24)):
+    """
+    Delete blobs nobody references. The grace period, counted from the last
+    time a blob was uploaded, re-uploaded, retained or released, keeps
+    blobs that are about to be attached to a row.
+    Returns the number of blobs removed.
+    """
+    from .models import Blob
+
+    storage = blob_storage()
+    cutoff = timezone.now() - grace
+    expired = Q(ref_count=0, last_referenced_at__lt=cutoff)
+    removed = 0
+    for pk in Blob.objects.filter(expired).values_list('pk', flat=True).iterator():
+        with transaction.atomic():
+            # Re-check under the row lock: a concurrent _save() either touched
+            # the blob first (it is kept) or waits and then writes a new copy
+            blob = Blob.objects.select_for_update().filter(expired, pk=pk).first()
+            if blob is None:
+                continue
+            storage.delete(blob.name)
+            blob.delete()
+            removed += 1
+    return removed
@@ -0,0 +1,37 @@
+# filestore/uploadhandlers.py
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+
+class HashingMixin:
+    """
+    Hash each chunk as the multipart parser hands it over, so the digest
+    is ready when the upload finishes and ContentAddressedStorage does not
+    have to read the file a second time.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingMixin, TemporaryFileUploadHandler):
+    pass
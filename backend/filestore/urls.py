@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import BlobUploadView, BlobDownloadView
+
+urlpatterns = [
+    path('blobs/', BlobUploadView.as_view(), name='blob-upload'),
+    path('blobs/<str:sha256>/', BlobDownloadView.as_view(), name='blob-download'),
+]
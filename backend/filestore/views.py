@@ -0,0 +1,115 @@
+import re
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .access import can_read_blob
+from .models import Blob
+from .storage import CHUNK_SIZE, blob_storage
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range ``Range`` header into an inclusive (start, end).
+    Returns None when no usable range was sent and raises ValueError when
+    the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def stream_file(handle, start, length):
+    try:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+class BlobUploadView(APIView):
+    """
+    Streamed upload into content-addressed storage. The digest is computed
+    chunk by chunk by the hashing upload handlers; identical content is
+    stored once. The response is the same whether or not the content was
+    already stored, so uploads cannot be used to probe for existing files.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+
+        name = blob_storage().save(upload.name, upload)
+        blob = Blob.objects.get(name=name)
+        return Response({
+            'sha256': blob.sha256,
+            'name': blob.name,
+            'size': blob.size,
+        }, status=status.HTTP_201_CREATED)
+
+
+class BlobDownloadView(APIView):
+    """
+    Serve a blob with HTTP Range support (206 partial responses) to users who
+    can see a row referencing it (see filestore.access). Anyone else gets a
+    404, so a digest does not reveal whether the content is stored.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, sha256):
+        blob = get_object_or_404(Blob, sha256=sha256)
+        if not can_read_blob(request.user, blob):
+            raise Http404
+        storage = blob_storage()
+        size = storage.size(blob.name)
+
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        start, end = byte_range if byte_range else (0, size - 1)
+        length = end - start + 1 if size else 0
+        response = StreamingHttpResponse(
+            stream_file(storage.open(blob.name, 'rb'), start, length),
+            status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            content_type='application/octet-stream',
+        )
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Length'] = str(length)
+        response['ETag'] = f'"{blob.sha256}"'
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return response
@@ -0,0 +1,78 @@
+# forum/access.py
+"""
+Which forums a user may read.
+
+A forum is open to the active members of its allowed_groups. The
+group -> forum ids index is small and shared by every user, so it is kept
+as one versioned entry in the shared cache; a user's forums are the union
+over their (cached, see groups.membership_cache) group ids. Changes to
+Forum.allowed_groups, or deleted forums and groups, replace the version
+once they commit; membership changes are already covered by the
+membership cache.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from groups.membership_cache import user_group_ids
+
+CACHE_TTL = 300  # seconds
+INDEX_KEY = 'forum:access:group_forums'
+VERSION_KEY = 'forum:access:version'
+
+
+def _group_forums():
+    """{group_id: frozenset(forum ids)} for every forum with allowed groups."""
+    cached = cache.get_many([INDEX_KEY, VERSION_KEY])
+    version = cached.get(VERSION_KEY)
+    entry = cached.get(INDEX_KEY)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    from .models import Forum
+
+    index = {}
+    for forum_id, group_id in Forum.allowed_groups.through.objects.values_list('forum_id', 'group_id'):
+        index.setdefault(group_id, set()).add(forum_id)
+    index = {group_id: frozenset(forum_ids) for group_id, forum_ids in index.items()}
+    cache.set(INDEX_KEY, (version, index), CACHE_TTL)
+    return index
+
+
+def is_forum_admin(user):
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def accessible_forum_ids(user):
+    """frozenset of the forum ids ``user`` may read; None for staff (every forum)."""
+    if is_forum_admin(user):
+        return None
+    if not user or not user.is_authenticated:
+        return frozenset()
+    index = _group_forums()
+    forum_ids = set()
+    for group_id in user_group_ids(user.pk):
+        forum_ids.update(index.get(group_id, ()))
+    return frozenset(forum_ids)
+
+
+def can_access_forum(user, forum_id):
+    forum_ids = accessible_forum_ids(user)
+    return forum_ids is None or forum_id in forum_ids
+
+
+def visible_forum_rows(queryset, user, forum_path='forum'):
+    """Narrow ``queryset`` to rows of forums ``user`` may read (``forum_path='pk'`` for Forum itself)."""
+    forum_ids = accessible_forum_ids(user)
+    if forum_ids is None:
+        return queryset
+    return queryset.filter(**{f'{forum_path}__in': forum_ids})
+
+
+def _publish():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_forum_access():
+    """Expire the group -> forums index once the current transaction commits."""
+    transaction.on_commit(_publish)
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-19 11:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_stats(apps, schema_editor):
+    Forum = apps.get_model('forum', 'Forum')
+    ForumPost = apps.get_model('forum', 'ForumPost')
+    latest = ForumPost.objects.filter(forum=OuterRef('pk')).order_by('-created_at', '-id')
+    Forum.objects.update(
+        post_count=Coalesce(Subquery(
+            ForumPost.objects.filter(forum=OuterRef('pk')).order_by().values('forum')
+            .annotate(total=Count('pk')).values('total')[:1]
+        ), 0),
+        last_post_at=Subquery(latest.values('created_at')[:1]),
+        last_post_author=Subquery(latest.values('author')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forum',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='forum',
+            name='last_post_author',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='forum',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='forumpost',
+            index=models.Index(fields=['forum', '-created_at', '-id'], name='forum_forum_forum_i_325cee_idx'),
+        ),
+        migrations.RunPython(backfill_post_stats, migrations.RunPython.noop),
+    ]
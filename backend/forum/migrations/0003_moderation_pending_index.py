@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 11:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0002_post_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moderationqueue',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at', 'id'], name='forum_modqueue_pending_idx'),
+        ),
+    ]
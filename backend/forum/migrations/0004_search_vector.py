@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-19 11:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS forum_forumpost_search_gin "
+        "ON forum_forumpost USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS forum_moderationqueue_search_gin "
+        "ON forum_moderationqueue USING gin (search_vector)"
+    )
+    # Backfill existing rows; new and edited rows are maintained by save().
+    schema_editor.execute(
+        "UPDATE forum_forumpost SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'A')"
+    )
+    schema_editor.execute(
+        "UPDATE forum_moderationqueue SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(reason, '')), 'B')"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS forum_forumpost_search_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS forum_moderationqueue_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0003_moderation_pending_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='moderationqueue',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
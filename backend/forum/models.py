@@ -1,12 +1,17 @@
 from django.db import models
 from django.utils.translation import gettext as _
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.search import SearchVectorField
 from groups.models import Group
 from users.models import User, UserActivity
+from .search import IncrementalSearchIndex
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Maintained by forum.signals, never by Forum.save
+POST_STAT_FIELDS = ('post_count', 'last_post_at', 'last_post_author')
+
 class Forum(models.Model):
     title = models.CharField(max_length=200, unique=True)
     description = models.TextField(blank=True)
@@ -25,6 +30,18 @@ class Forum(models.Model):
         null=True,
         related_name='created_forums'
     )
+    # Denormalised from ForumPost by forum.signals so listings need no
+    # per-forum COUNT or posts prefetch
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    last_post_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_post_author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
 
     class Meta:
         ordering = ['title']
@@ -41,6 +58,12 @@ class Forum(models.Model):
     def save(self, *args, **kwargs):
         created = not self.pk
         self.full_clean()
+        if not created and kwargs.get('update_fields') is None:
+            # Never write back a stale copy of the post stats
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in POST_STAT_FIELDS
+            ]
         super().save(*args, **kwargs)
 
         activity_type = 'forum_created' if created else 'forum_updated'
@@ -48,6 +71,7 @@ class Forum(models.Model):
             activity_type=activity_type,
             user=self.created_by,
             details=f'Forum "{self.title}" was {"created" if created else "updated"}',
+            target=self,
             status='success'
         )
 
@@ -56,11 +80,26 @@ class Forum(models.Model):
             activity_type='forum_deleted',
             user=self.created_by,
             details=f'Forum "{self.title}" was deleted',
+            target=self,
+            payload={'title': self.title},
             status='system'
         )
         super().delete(*args, **kwargs)
 
-class ForumPost(models.Model):
+    def refresh_post_stats(self):
+        """Recompute the denormalised post count and last-post columns from the posts table."""
+        last = self.posts.order_by('-created_at', '-id').values('created_at', 'author_id').first()
+        Forum.objects.filter(pk=self.pk).update(
+            post_count=self.posts.count(),
+            last_post_at=last['created_at'] if last else None,
+            last_post_author_id=last['author_id'] if last else None,
+        )
+
+class ForumPost(IncrementalSearchIndex, models.Model):
+    SEARCH_FIELDS = (
+        ('content', 'A'),
+    )
+
     forum = models.ForeignKey(
         Forum,
         on_delete=models.CASCADE,
@@ -84,9 +123,16 @@ class ForumPost(models.Model):
         blank=True,
         related_name='moderated_posts'
     )
+    # Maintained by save() via forum.search; GIN-indexed on Postgres
+    # (see migration 0004, the index is skipped on other backends).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pages of one forum's posts (/forums/<id>/posts/)
+            models.Index(fields=['forum', '-created_at', '-id']),
+        ]
         verbose_name = _('Forum Post')
         verbose_name_plural = _('Forum Posts')
 
@@ -95,13 +141,18 @@ class ForumPost(models.Model):
 
     def save(self, *args, **kwargs):
         created = not self.pk
+        reindex = self.search_source_changed(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
+        if reindex:
+            self.reindex()
 
         if created:
             UserActivity.objects.create(
                 activity_type='forum_post_created',
                 user=self.author,
                 details=f'Created post in forum "{self.forum.title}"',
+                target=self.forum,
+                payload={'post_id': self.pk},
                 status='success'
             )
 
@@ -112,7 +163,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-class ModerationQueue(models.Model):
+class ModerationQueue(IncrementalSearchIndex, models.Model):
+    SEARCH_FIELDS = (
+        ('content', 'A'),
+        ('reason', 'B'),
+    )
+
     STATUS_CHOICES = (
         ('pending', 'Pending'),
         ('approved', 'Approved'),
@@ -140,9 +196,20 @@ class ModerationQueue(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by save() via forum.search; GIN-indexed on Postgres
+    # (see migration 0004, the index is skipped on other backends).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Only pending rows: pending_count and the moderator worklist
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='forum_modqueue_pending_idx'
+            ),
+        ]
         verbose_name = _('Moderation Queue')
         verbose_name_plural = _('Moderation Queues')
 
@@ -151,13 +218,18 @@ class ModerationQueue(models.Model):
 
     def save(self, *args, **kwargs):
         created = not self.pk
+        reindex = self.search_source_changed(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
+        if reindex:
+            self.reindex()
 
         if created:
             UserActivity.objects.create(
                 activity_type='moderation_item_created',
                 user=self.reported_by,
                 details=f'Reported {self.content_type} {self.content_id}',
+                target=self,
+                payload={'content_type': self.content_type, 'content_id': self.content_id},
                 status='success'
             )
         elif self.status != 'pending':
@@ -165,5 +237,7 @@ class ModerationQueue(models.Model):
                 activity_type='moderation_item_updated',
                 user=self.moderated_by,
                 details=f'Moderated {self.content_type} {self.content_id} as {self.status}',
+                target=self,
+                payload={'content_type': self.content_type, 'content_id': self.content_id, 'status': self.status},
                 status='success'
             )
\ No newline at end of file
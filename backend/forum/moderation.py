@@ -0,0 +1,88 @@
+# forum/moderation.py
+"""
+Set-based moderation of many queue items at once.
+
+moderate_items() approves or rejects a batch of pending ModerationQueue
+rows in one transaction: the queue rows are updated with one statement
+per chunk, the reported content is updated per content_type with one
+statement per chunk (see CONTENT_MODERATORS), and a single aggregate
+UserActivity row records the batch instead of one per item and post.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import UserActivity
+
+from .models import ForumPost, ModerationQueue
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists within every backend's parameter limit
+CHUNK_SIZE = 1000
+ACTION_STATUSES = {'approve': 'approved', 'reject': 'rejected'}
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = sorted(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _moderate_forum_posts(content_ids, approved, moderator, now):
+    for chunk in _chunks(content_ids):
+        ForumPost.objects.filter(pk__in=chunk).update(
+            is_approved=approved, moderated_by=moderator, moderated_at=now
+        )
+
+
+# content_type -> fn(content_ids, approved, moderator, now)
+CONTENT_MODERATORS = {
+    'forum_post': _moderate_forum_posts,
+}
+
+
+def moderate_items(item_ids, action, moderator, notes=''):
+    """
+    Apply ``action`` ('approve' or 'reject') to the pending items among
+    ``item_ids``. Items that are missing or no longer pending are skipped
+    (another moderator got there first). Returns {'moderated', 'skipped'}.
+    """
+    status = ACTION_STATUSES[action]
+    requested = set(item_ids)
+    now = timezone.now()
+
+    with transaction.atomic():
+        items = []
+        for chunk in _chunks(requested):
+            items.extend(
+                ModerationQueue.objects.select_for_update()
+                .filter(pk__in=chunk, status='pending')
+                .values_list('pk', 'content_type', 'content_id')
+            )
+        moderated = sorted(pk for pk, _, _ in items)
+        for chunk in _chunks(moderated):
+            ModerationQueue.objects.filter(pk__in=chunk).update(
+                status=status, moderation_notes=notes, moderated_by=moderator, updated_at=now
+            )
+
+        by_type = {}
+        for _, content_type, content_id in items:
+            by_type.setdefault(content_type, set()).add(content_id)
+        for content_type, content_ids in by_type.items():
+            handler = CONTENT_MODERATORS.get(content_type)
+            if handler is not None:
+                handler(content_ids, status == 'approved', moderator, now)
+
+        if moderated:
+            UserActivity.objects.create(
+                user=moderator,
+                activity_type='moderation_batch',
+                details=f'Moderated {len(moderated)} item(s) as {status}',
+                payload={'status': status, 'items': moderated},
+                status='success'
+            )
+
+    logger.info("Moderated %s item(s) as %s", len(moderated), status)
+    return {'moderated': moderated, 'skipped': sorted(requested - set(moderated))}
@@ -0,0 +1,92 @@
+# forum/search.py
+"""
+Full-text search over forum posts and moderation queue items.
+
+Each searchable model lists its indexed columns and their weights in
+SEARCH_FIELDS; its save() refreshes the stored, GIN-indexed tsvector when
+one of them changed (see IncrementalSearchIndex). Queries reuse the
+prefix tsquery and the in-memory fallback index of messaging.search, so
+SQLite runs rank the same way without full-text support.
+"""
+from django.db.models import Case, F, IntegerField, Value, When
+from django.contrib.postgres.search import SearchRank, SearchVector
+
+from messaging.search import (
+    SEARCH_CONFIG, InvertedIndex, build_prefix_query, uses_postgres_search
+)
+
+
+def build_search_vector(instance):
+    vector = None
+    for field, weight in instance.SEARCH_FIELDS:
+        part = SearchVector(Value(getattr(instance, field) or ''), weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(instance):
+    """Refresh the stored tsvector for a single row (no-op off Postgres)."""
+    if not uses_postgres_search():
+        return
+    type(instance).objects.filter(pk=instance.pk).update(search_vector=build_search_vector(instance))
+
+
+class IncrementalSearchIndex:
+    """
+    Model mixin remembering the SEARCH_FIELDS values a row was loaded with,
+    so save() rebuilds search_vector only for new rows or changed text.
+    """
+    SEARCH_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._indexed_source = instance._search_source()
+        return instance
+
+    def _search_source(self):
+        # Deferred fields are absent from __dict__ and compare as unchanged
+        return tuple(self.__dict__.get(field) for field, _ in self.SEARCH_FIELDS)
+
+    def search_source_changed(self, update_fields=None):
+        if self.pk is None:
+            return True
+        if update_fields is not None and not {field for field, _ in self.SEARCH_FIELDS} & set(update_fields):
+            return False
+        return self._search_source() != getattr(self, '_indexed_source', None)
+
+    def reindex(self):
+        update_search_vector(self)
+        self._indexed_source = self._search_source()
+
+
+def _fallback_search(queryset, terms, fields):
+    index = InvertedIndex()
+    for pk, *values in queryset.order_by().values_list('id', *fields):
+        index.add(pk, dict(zip(fields, values)))
+    ranked = [pk for pk, _ in index.search(terms)]
+    if not ranked:
+        return queryset.none()
+    ordering = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked)],
+        output_field=IntegerField()
+    )
+    return queryset.filter(pk__in=ranked).annotate(search_position=ordering).order_by('search_position')
+
+
+def search_rows(queryset, terms):
+    """
+    Rank ``queryset`` (already scoped and filtered) against ``terms`` with
+    prefix matching, best first and newest first among equals. Uses the
+    GIN-indexed tsvector on Postgres and the in-memory index elsewhere.
+    """
+    if not uses_postgres_search():
+        fields = [field for field, _ in queryset.model.SEARCH_FIELDS]
+        return _fallback_search(queryset, terms, fields)
+
+    query = build_prefix_query(terms)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query)
+    ).order_by('-rank', '-created_at', '-id')
@@ -2,15 +2,15 @@ from rest_framework import serializers
 from .models import Forum, ForumPost
 from groups.serializers import GroupSerializer
 from groups.models import Group
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer
 from users.models import User
 from rest_framework import serializers
 from .models import ModerationQueue
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer
 from users.models import User
 
 class ForumPostSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
+    author = UserSummarySerializer(read_only=True)
     author_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         write_only=True,
@@ -30,34 +30,31 @@ class ForumSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
-    created_by = UserSerializer(read_only=True)
+    created_by = UserSummarySerializer(read_only=True)
     created_by_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         write_only=True,
         required=False
     )
-    posts = ForumPostSerializer(many=True, read_only=True, default=[])
-    post_count = serializers.SerializerMethodField()
+    last_post_author = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = Forum
-        fields = ['id', 'title', 'description', 'allowed_groups', 'allowed_group_ids', 'is_active', 'created_at', 'updated_at', 'created_by', 'created_by_id', 'posts', 'post_count']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'posts']
-
-    def get_post_count(self, obj):
-        return obj.posts.count()
+        # Posts are paged separately from /forums/<id>/posts/
+        fields = ['id', 'title', 'description', 'allowed_groups', 'allowed_group_ids', 'is_active', 'created_at', 'updated_at', 'created_by', 'created_by_id', 'post_count', 'last_post_at', 'last_post_author']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'post_count', 'last_post_at', 'last_post_author']
 
 
 
 
 class ModerationQueueSerializer(serializers.ModelSerializer):
-    reported_by = UserSerializer(read_only=True)
+    reported_by = UserSummarySerializer(read_only=True)
     reported_by_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         write_only=True,
         required=False
     )
-    moderated_by = UserSerializer(read_only=True)
+    moderated_by = UserSummarySerializer(read_only=True)
     moderated_by_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         write_only=True,
@@ -0,0 +1,45 @@
+# forum/signals.py
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from groups.models import Group
+from .access import invalidate_forum_access
+from .models import Forum, ForumPost
+
+
+@receiver(post_save, sender=ForumPost)
+def count_new_post(sender, instance, created, **kwargs):
+    if not created:
+        return
+    Forum.objects.filter(pk=instance.forum_id).update(
+        post_count=F('post_count') + 1,
+        last_post_at=instance.created_at,
+        last_post_author_id=instance.author_id,
+    )
+
+
+@receiver(post_delete, sender=ForumPost)
+def uncount_deleted_post(sender, instance, **kwargs):
+    forum = Forum.objects.filter(pk=instance.forum_id).only('pk', 'last_post_at').first()
+    if forum is None:
+        # The forum itself is being deleted
+        return
+    if forum.last_post_at is not None and instance.created_at >= forum.last_post_at:
+        forum.refresh_post_stats()
+    else:
+        Forum.objects.filter(pk=forum.pk).update(post_count=Greatest(F('post_count') - 1, 0))
+
+
+@receiver(m2m_changed, sender=Forum.allowed_groups.through)
+def allowed_groups_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_forum_access()
+
+
+@receiver(post_delete, sender=Forum)
+@receiver(post_delete, sender=Group)
+def forum_or_group_deleted(sender, instance, **kwargs):
+    # Cascaded allowed_groups rows go without an m2m_changed signal
+    invalidate_forum_access()
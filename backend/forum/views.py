@@ -6,30 +6,66 @@ from .serializers import ForumSerializer, ForumPostSerializer
 from users.models import UserActivity
 from django.db.models import Prefetch, Count
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from groups.models import GroupMembership
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from .access import can_access_forum, is_forum_admin, visible_forum_rows
+from .search import search_rows
+from groups.serializers import groups_with_member_counts
+from users.serializers import with_user_summaries
+from lms_admin.pagination import KeysetPagination
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from .models import ModerationQueue
+from .moderation import ACTION_STATUSES, moderate_items
 from .serializers import ModerationQueueSerializer
 from users.models import UserActivity
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from metrics.counts import register_count, read_counts, wants_exact
+
+FORUM_STAT_COUNTS = [
+    register_count('forums.active', lambda: Forum.objects.filter(is_active=True)),
+    register_count('forums.posts', lambda: ForumPost.objects.all()),
+]
+
+class ForumPostPagination(KeysetPagination):
+    # Matches the (forum, -created_at, -id) index on ForumPost
+    ordering = ('-created_at', '-id')
+
+
+class ModerationWorklistPagination(KeysetPagination):
+    # Oldest first; served by the partial index on pending items
+    ordering = ('created_at', 'id')
+
+
+# Largest batch accepted by ModerationQueueViewSet.bulk_moderate
+MAX_MODERATION_BATCH = 5000
+
+
+def _int_param(request, name):
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be an integer'})
+
 
 class IsForumMemberOrAdmin(permissions.BasePermission):
+    """Staff, or a member of one of the forum's allowed groups (checked against forum.access)."""
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
     def has_object_permission(self, request, view, obj):
-        if request.user.is_staff:
+        if is_forum_admin(request.user):
             return True
-        return GroupMembership.objects.filter(
-            user=request.user,
-            group__in=obj.allowed_groups.all(),
-            is_active=True
-        ).exists()
+        forum_id = obj.pk if isinstance(obj, Forum) else obj.forum_id
+        return can_access_forum(request.user, forum_id)
 
 class ForumViewSet(viewsets.ModelViewSet):
-    queryset = Forum.objects.prefetch_related(
-        Prefetch('allowed_groups'),
-        Prefetch('posts'),
-        Prefetch('created_by')
+    queryset = with_user_summaries(Forum.objects.all(), 'created_by', 'last_post_author').prefetch_related(
+        Prefetch('allowed_groups', queryset=groups_with_member_counts())
     )
     serializer_class = ForumSerializer
     permission_classes = [IsAuthenticated]
@@ -39,6 +75,9 @@ class ForumViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]
         return [IsForumMemberOrAdmin()]
 
+    def get_queryset(self):
+        return visible_forum_rows(super().get_queryset(), self.request.user, 'pk')
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
@@ -48,17 +87,27 @@ class ForumViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         instance.delete()
 
+    @action(detail=True, methods=['get'])
+    def posts(self, request, pk=None):
+        """The forum's posts, newest first, in keyset pages (?cursor=, ?page_size=, ?count=exact)."""
+        forum = self.get_object()
+        paginator = ForumPostPagination()
+        page = paginator.paginate_queryset(
+            with_user_summaries(forum.posts.defer('search_vector'), 'author'), request, view=self
+        )
+        serializer = ForumPostSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        active_forums = Forum.objects.filter(is_active=True).count()
-        total_posts = ForumPost.objects.count()
+        counts = read_counts(FORUM_STAT_COUNTS, exact=wants_exact(request))
         return Response({
-            'active_forums': active_forums,
-            'total_posts': total_posts
+            'active_forums': counts['forums.active'],
+            'total_posts': counts['forums.posts']
         })
 
 class ForumPostViewSet(viewsets.ModelViewSet):
-    queryset = ForumPost.objects.select_related('forum', 'author', 'moderated_by')
+    queryset = with_user_summaries(ForumPost.objects.select_related('forum'), 'author').defer('search_vector')
     serializer_class = ForumPostSerializer
     permission_classes = [IsAuthenticated]
 
@@ -67,7 +116,30 @@ class ForumPostViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]
         return [IsForumMemberOrAdmin()]
 
+    def get_queryset(self):
+        queryset = visible_forum_rows(super().get_queryset(), self.request.user)
+        if self.action != 'list':
+            return queryset
+
+        params = self.request.query_params
+        forum_id = _int_param(self.request, 'forum')
+        author_id = _int_param(self.request, 'author')
+        approved = params.get('is_approved')
+        search = params.get('search')
+        if forum_id is not None:
+            queryset = queryset.filter(forum_id=forum_id)
+        if author_id is not None:
+            queryset = queryset.filter(author_id=author_id)
+        if approved in ('true', 'false'):
+            queryset = queryset.filter(is_approved=approved == 'true')
+        if search:
+            # Ranked full-text search over the posts the user can read
+            queryset = search_rows(queryset, search)
+        return queryset
+
     def perform_create(self, serializer):
+        if not can_access_forum(self.request.user, serializer.validated_data['forum'].pk):
+            raise PermissionDenied('You are not a member of this forum')
         serializer.save(author=self.request.user)
 
     def perform_update(self, serializer):
@@ -76,7 +148,9 @@ class ForumPostViewSet(viewsets.ModelViewSet):
 
 
 class ModerationQueueViewSet(viewsets.ModelViewSet):
-    queryset = ModerationQueue.objects.select_related('reported_by', 'moderated_by')
+    queryset = with_user_summaries(
+        ModerationQueue.objects.defer('search_vector'), 'reported_by', 'moderated_by'
+    )
     serializer_class = ModerationQueueSerializer
     permission_classes = [IsAuthenticated]
 
@@ -85,6 +159,18 @@ class ModerationQueueViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated()]
         return [IsAdminUser()]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        status_filter = self.request.query_params.get('status')
+        search = self.request.query_params.get('search')
+        if status_filter and status_filter != 'all':
+            queryset = queryset.filter(status=status_filter)
+        if search:
+            queryset = search_rows(queryset, search)
+        return queryset
+
     def perform_create(self, serializer):
         serializer.save(reported_by=self.request.user)
 
@@ -118,6 +204,36 @@ class ModerationQueueViewSet(viewsets.ModelViewSet):
 
         return Response({'status': f'Content {action}d successfully'})
 
+    @action(detail=False, methods=['post'], url_path='moderate')
+    def bulk_moderate(self, request):
+        """Approve or reject many pending items in one transaction: {"ids": [...], "action": ...}."""
+        action = request.data.get('action')
+        ids = request.data.get('ids')
+        if action not in ACTION_STATUSES:
+            return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_MODERATION_BATCH:
+            return Response(
+                {'error': f'At most {MAX_MODERATION_BATCH} items per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(item_id) for item_id in ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = moderate_items(ids, action, request.user, request.data.get('moderation_notes', ''))
+        return Response(result)
+
+    @action(detail=False, methods=['get'])
+    def pending(self, request):
+        """The moderator worklist: pending items, oldest first, in keyset pages."""
+        paginator = ModerationWorklistPagination()
+        page = paginator.paginate_queryset(self.get_queryset().filter(status='pending'), request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def pending_count(self, request):
         count = ModerationQueue.objects.filter(status='pending').count()
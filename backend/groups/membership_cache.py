@@ -0,0 +1,82 @@
+# groups/membership_cache.py
+"""
+Cached group membership for access checks and fan-out.
+
+Two views of the active memberships are kept in the shared cache as
+compact sorted int arrays:
+
+- user_group_ids(user_id): the groups a user is an active member of
+- group_member_ids(group_id): the active members of a group
+
+Entries are stamped with a per-user / per-group version token, read
+together with the entry (as for the auth snapshot in users.authentication),
+so a reload that races with a membership change is discarded on the next
+read. GroupMembership save/delete hooks (groups.signals) replace the
+tokens once the change commits; bulk paths (groups.sync) call
+invalidate_memberships() themselves.
+"""
+import uuid
+from array import array
+
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_TTL = 300  # seconds; versions make this a memory bound, not a staleness bound
+KEY_PREFIX = 'groups:membership'
+
+
+def _keys(kind, ident):
+    return f'{KEY_PREFIX}:{kind}:{ident}', f'{KEY_PREFIX}:{kind}_version:{ident}'
+
+
+def _cached_ids(kind, ident, load):
+    data_key, version_key = _keys(kind, ident)
+    cached = cache.get_many([data_key, version_key])
+    version = cached.get(version_key)
+    entry = cached.get(data_key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    ids = array('q', sorted(set(load())))
+    cache.set(data_key, (version, ids), CACHE_TTL)
+    return ids
+
+
+def user_group_ids(user_id):
+    """frozenset of the ids of groups ``user_id`` is an active member of."""
+    from .models import GroupMembership
+
+    return frozenset(_cached_ids('user', user_id, lambda: GroupMembership.objects.filter(
+        user_id=user_id, is_active=True
+    ).values_list('group_id', flat=True)))
+
+
+def group_member_ids(group_id):
+    """Sorted array('q') of the active members' user ids."""
+    from .models import GroupMembership
+
+    return _cached_ids('group', group_id, lambda: GroupMembership.objects.filter(
+        group_id=group_id, is_active=True
+    ).values_list('user_id', flat=True))
+
+
+def members_of_groups(group_ids):
+    """Union of the active members of ``group_ids``."""
+    members = set()
+    for group_id in group_ids:
+        members.update(group_member_ids(group_id))
+    return members
+
+
+def _publish(user_ids, group_ids):
+    versions = {_keys('user', user_id)[1]: uuid.uuid4().hex for user_id in user_ids}
+    versions.update({_keys('group', group_id)[1]: uuid.uuid4().hex for group_id in group_ids})
+    if versions:
+        cache.set_many(versions, None)
+
+
+def invalidate_memberships(user_ids=(), group_ids=()):
+    """Expire the cached sets of ``user_ids`` and ``group_ids`` once the transaction commits."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    group_ids = {group_id for group_id in group_ids if group_id is not None}
+    if user_ids or group_ids:
+        transaction.on_commit(lambda: _publish(user_ids, group_ids))
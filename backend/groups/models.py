@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 import logging
 from users.models import UserActivity
+from .registry import role_registry
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +36,20 @@ class Role(models.Model):
         created = not self.pk
         self.full_clean()
         super().save(*args, **kwargs)
+        role_registry.invalidate()
         
         if created:
             UserActivity.objects.create(
                 activity_type='role_created',
                 details=f'Role "{self.name}" was created',
+                target=self,
                 status='success'
             )
         else:
             UserActivity.objects.create(
                 activity_type='role_updated',
                 details=f'Role "{self.name}" was updated',
+                target=self,
                 status='success'
             )
 
@@ -53,9 +57,12 @@ class Role(models.Model):
         UserActivity.objects.create(
             activity_type='role_deleted',
             details=f'Role "{self.name}" was deleted',
+            target=self,
+            payload={'name': self.name},
             status='system'
         )
         super().delete(*args, **kwargs)
+        role_registry.invalidate()
 
 class Group(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -0,0 +1,104 @@
+# groups/registry.py
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_CACHE_KEY = 'groups:role_registry:version'
+VERSION_CHECK_INTERVAL = 5  # seconds between shared-version checks per process
+# Reload at least this often even if the version never moved (cache evicted
+# or unreachable): bounds how long a worker can serve stale roles
+MAX_AGE = 300  # seconds
+
+
+class RoleRegistry:
+    """
+    Process-local map of role code -> Role, loaded with one query and reused
+    for display names, the default role and permission lookups. Each role's
+    permissions list is compiled to a frozenset at load time so a check is a
+    single hash lookup (see users.permissions.has_perm). Role.save
+    and Role.delete bump a version number in the shared cache (CACHES) once
+    their transaction commits; every worker compares it (at most every
+    VERSION_CHECK_INTERVAL seconds) and reloads when it moved, and reloads
+    unconditionally after MAX_AGE.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._roles = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def _shared_version(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(VERSION_CACHE_KEY, 1, None)
+            version = cache.get(VERSION_CACHE_KEY, 1)
+        return version
+
+    def _load(self):
+        from .models import Role
+        roles = {}
+        for role in Role.objects.all():
+            role.permission_set = frozenset(
+                code for code in (role.permissions or ()) if isinstance(code, str)
+            )
+            roles[role.code] = role
+        return roles
+
+    def roles(self):
+        now = time.monotonic()
+        if self._roles is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return self._roles
+        with self._lock:
+            version = self._shared_version()
+            if self._roles is None or version != self._version or now - self._loaded_at >= MAX_AGE:
+                self._roles = self._load()
+                self._version = version
+                self._loaded_at = now
+            self._checked_at = now
+            return self._roles
+
+    def get(self, code):
+        return self.roles().get(code)
+
+    def permissions(self, code):
+        """frozenset of the permission codes granted to role ``code``."""
+        role = self.get(code)
+        return role.permission_set if role is not None else frozenset()
+
+    def display_name(self, code):
+        role = self.get(code)
+        return role.name if role else code
+
+    def default_code(self):
+        for role in self.roles().values():
+            if role.is_default:
+                return role.code
+        return None
+
+    def invalidate(self):
+        """
+        Drop this process's copy and, once the current transaction commits,
+        tell the other workers to reload. Bumping earlier would let them
+        reload the pre-commit rows under the new version.
+        """
+        self._drop()
+        transaction.on_commit(self._publish)
+
+    def _publish(self):
+        try:
+            cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(VERSION_CACHE_KEY, 2, None)
+        self._drop()
+
+    def _drop(self):
+        with self._lock:
+            self._roles = None
+            self._version = None
+
+
+role_registry = RoleRegistry()
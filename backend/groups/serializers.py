@@ -1,6 +1,7 @@
+from django.db.models import Count
 from rest_framework import serializers
 from .models import Role, Group, GroupMembership
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer, with_user_summaries
 from users.models import User
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -9,7 +10,7 @@ class RoleSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class GroupMembershipSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
         write_only=True
@@ -25,19 +26,37 @@ class GroupMembershipSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('joined_at',)
 
+def membership_summaries(queryset=None):
+    """Memberships with their role and a summary-only user, as GroupMembershipSerializer needs."""
+    if queryset is None:
+        queryset = GroupMembership.objects.all()
+    return with_user_summaries(queryset.select_related('role'), 'user')
+
+
+def groups_with_member_counts(queryset=None):
+    """Groups annotated with member_count, as GroupSerializer needs (also for Prefetch())."""
+    if queryset is None:
+        queryset = Group.objects.all()
+    # The GROUP BY drops Meta.ordering, so restate it for stable pagination
+    return queryset.select_related('role').annotate(
+        member_count=Count('memberships')
+    ).order_by(*Group._meta.ordering)
+
+
 class GroupSerializer(serializers.ModelSerializer):
     role = RoleSerializer(read_only=True)
     role_id = serializers.IntegerField(write_only=True)  # Add this line
-    memberships = GroupMembershipSerializer(
-        many=True,
-        read_only=True,
-        default=[]
-    )
+    # Members themselves come from the paginated roster (GroupViewSet.members)
+    member_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Group
-        fields = ['id', 'name', 'description', 'role', 'role_id', 'is_active', 'memberships']
-        read_only_fields = ['id', 'memberships']
+        fields = ['id', 'name', 'description', 'role', 'role_id', 'is_active', 'member_count']
+        read_only_fields = ['id', 'member_count']
+
+    def get_member_count(self, obj):
+        count = getattr(obj, 'member_count', None)
+        return obj.memberships.count() if count is None else count
 
     def to_internal_value(self, data):
         # Ensure role_id is treated as an integer
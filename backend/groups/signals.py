@@ -1,21 +1,43 @@
 # groups/signals.py
-from django.db.models.signals import post_save, post_delete, pre_save
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_init, post_save, post_delete, pre_save
 from django.dispatch import receiver
+from .membership_cache import invalidate_memberships
 from .models import Group, GroupMembership
 from users.models import UserActivity
 
+# Set while groups.sync applies a batch that it logs as one aggregate entry
+_bulk_membership_change = ContextVar('bulk_membership_change', default=False)
+
+
+@contextmanager
+def aggregate_membership_activity():
+    """
+    Skip the per-membership activity rows and cache invalidations; the
+    caller logs the batch and calls invalidate_memberships() itself.
+    """
+    token = _bulk_membership_change.set(True)
+    try:
+        yield
+    finally:
+        _bulk_membership_change.reset(token)
+
 @receiver(post_save, sender=Group)
 def log_group_activity(sender, instance, created, **kwargs):
     if created:
         UserActivity.objects.create(
             activity_type='group_created',
             details=f'Group "{instance.name}" was created',
+            target=instance,
             status='success'
         )
     else:
         UserActivity.objects.create(
             activity_type='group_updated',
             details=f'Group "{instance.name}" was updated',
+            target=instance,
             status='success'
         )
 
@@ -24,6 +46,8 @@ def log_group_deletion(sender, instance, **kwargs):
     UserActivity.objects.create(
         activity_type='group_deleted',
         details=f'Group "{instance.name}" was deleted',
+        target=instance,
+        payload={'name': instance.name},
         status='system'
     )
 
@@ -34,6 +58,8 @@ def log_membership_activity(sender, instance, created, **kwargs):
             user=instance.user,
             activity_type='group_member_added',
             details=f'User added to group "{instance.group.name}"',
+            target=instance.group,
+            payload={'membership_id': instance.pk},
             status='success'
         )
     else:
@@ -41,14 +67,36 @@ def log_membership_activity(sender, instance, created, **kwargs):
             user=instance.user,
             activity_type='group_member_updated',
             details=f'Membership in group "{instance.group.name}" was updated',
+            target=instance.group,
+            payload={'membership_id': instance.pk},
             status='success'
         )
 
 @receiver(post_delete, sender=GroupMembership)
 def log_membership_removal(sender, instance, **kwargs):
+    if _bulk_membership_change.get():
+        return
     UserActivity.objects.create(
         user=instance.user,
         activity_type='group_member_removed',
         details=f'User removed from group "{instance.group.name}"',
+        target=instance.group,
+        payload={'membership_id': instance.pk},
         status='system'
-    )
\ No newline at end of file
+    )
+
+
+@receiver(post_init, sender=GroupMembership)
+def remember_membership_keys(sender, instance, **kwargs):
+    # A save that moves a membership must also expire the old user/group sets
+    instance._cached_membership = (instance.__dict__.get('user_id'), instance.__dict__.get('group_id'))
+
+
+@receiver(post_save, sender=GroupMembership)
+@receiver(post_delete, sender=GroupMembership)
+def invalidate_membership_cache(sender, instance, **kwargs):
+    if _bulk_membership_change.get():
+        return
+    previous_user, previous_group = getattr(instance, '_cached_membership', (None, None))
+    invalidate_memberships({previous_user, instance.user_id}, {previous_group, instance.group_id})
+    instance._cached_membership = (instance.user_id, instance.group_id)
@@ -0,0 +1,93 @@
+# groups/sync.py
+"""
+Set-based group membership synchronisation.
+
+sync_group_members() replaces a group's member list in a fixed number of
+statements however large the group: the diff is computed from two id
+sets, additions are bulk-inserted, removals bulk-deleted, and a single
+aggregate UserActivity row records the change. Per-membership save() and
+the per-row activity entries are bypassed on purpose; their checks are
+applied to the whole batch here instead. Deletes still go through the ORM,
+so other post_delete receivers run as usual.
+"""
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from users.models import User, UserActivity
+
+from .membership_cache import invalidate_memberships
+from .models import Group, GroupMembership
+from .signals import aggregate_membership_activity
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists and INSERT batches within every backend's parameter limit
+CHUNK_SIZE = 1000
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = sorted(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _clean_user_ids(user_ids):
+    """Normalise requested ids to a set of existing user pks, or raise ValidationError."""
+    try:
+        requested = {int(user_id) for user_id in user_ids}
+    except (TypeError, ValueError):
+        raise ValidationError('Member ids must be integers')
+    existing = set()
+    for chunk in _chunks(requested):
+        existing.update(User.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+    invalid = requested - existing
+    if invalid:
+        raise ValidationError(f'Invalid user IDs: {invalid}')
+    return requested
+
+
+def sync_group_members(group, user_ids, actor=None):
+    """
+    Make ``user_ids`` the exact member list of ``group``.
+
+    New memberships take the group's role (the invariant GroupMembership.clean
+    enforces row by row). Returns {'added', 'removed', 'total_members'}.
+    """
+    wanted = _clean_user_ids(user_ids)
+
+    with transaction.atomic():
+        # Serialise concurrent syncs of the same group
+        group = Group.objects.select_for_update().select_related('role').get(pk=group.pk)
+        current = set(group.memberships.values_list('user_id', flat=True))
+        added = wanted - current
+        removed = current - wanted
+
+        GroupMembership.objects.bulk_create(
+            [GroupMembership(user_id=user_id, group=group, role=group.role) for user_id in sorted(added)],
+            batch_size=CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+        with aggregate_membership_activity():
+            for chunk in _chunks(removed):
+                GroupMembership.objects.filter(group=group, user_id__in=chunk).delete()
+        # bulk_create sends no signals and the deletes were muted above
+        invalidate_memberships(added | removed, [group.pk])
+
+        if added or removed:
+            UserActivity.objects.create(
+                user=actor if actor is not None and actor.is_authenticated else None,
+                activity_type='group_members_synced',
+                details=f'Group "{group.name}" members synced: {len(added)} added, {len(removed)} removed',
+                target=group,
+                payload={'added': sorted(added), 'removed': sorted(removed)},
+                status='success'
+            )
+
+    logger.info("Synced group %s: %s added, %s removed", group.pk, len(added), len(removed))
+    return {
+        'added': sorted(added),
+        'removed': sorted(removed),
+        'total_members': len(wanted),
+    }
@@ -1,16 +1,47 @@
+import csv
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from .models import Role, Group, GroupMembership
-from .serializers import RoleSerializer, GroupSerializer, GroupMembershipSerializer
+from .serializers import (RoleSerializer, GroupSerializer, GroupMembershipSerializer,
+                          groups_with_member_counts, membership_summaries)
 from users.models import UserActivity
+from users.search import search_users
+from .sync import sync_group_members
+from django.core.exceptions import ValidationError
 from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from lms_admin.pagination import KeysetPagination
 from django.contrib.auth import get_user_model
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.exceptions import NotFound
 
 User = get_user_model()
 
+ROSTER_EXPORT_FIELDS = (
+    'user_id', 'user__email', 'user__first_name', 'user__last_name',
+    'role__code', 'is_active', 'is_primary', 'joined_at',
+)
+ROSTER_EXPORT_HEADER = (
+    'user_id', 'email', 'first_name', 'last_name',
+    'role', 'is_active', 'is_primary', 'joined_at',
+)
+ROSTER_EXPORT_CHUNK_SIZE = 2000
+
+
+class RosterPagination(KeysetPagination):
+    ordering = ('id',)
+    page_size = 50
+    max_page_size = 500
+
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer in a streaming response."""
+
+    def write(self, value):
+        return value
+
 class RoleViewSet(viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
@@ -24,6 +55,7 @@ class RoleViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='role_created',
             details=f'Created role "{role.name}"',
+            target=role,
             status='success'
         )
 
@@ -33,6 +65,7 @@ class RoleViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='role_updated',
             details=f'Updated role "{role.name}"',
+            target=role,
             status='success'
         )
 
@@ -41,15 +74,14 @@ class RoleViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='role_deleted',
             details=f'Deleted role "{instance.name}"',
+            target=instance,
+            payload={'name': instance.name},
             status='system'
         )
         instance.delete()
 
 class GroupViewSet(viewsets.ModelViewSet):
-    queryset = Group.objects.prefetch_related(
-        Prefetch('role'),  # Updated to single role
-        Prefetch('memberships', queryset=GroupMembership.objects.select_related('user', 'role'))
-    )
+    queryset = groups_with_member_counts()
     serializer_class = GroupSerializer
     permission_classes = [AllowAny]
     # permission_classes = [permissions.IsAdminUser]
@@ -67,6 +99,7 @@ class GroupViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='group_created',
             details=f'Created group "{group.name}"',
+            target=group,
             status='success'
         )
 
@@ -77,6 +110,7 @@ class GroupViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='group_updated',
             details=f'Updated group "{group.name}"',
+            target=group,
             status='success'
         )
 
@@ -85,65 +119,54 @@ class GroupViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='group_deleted',
             details=f'Deleted group "{instance.name}"',
+            target=instance,
+            payload={'name': instance.name},
             status='system'
         )
         instance.delete()
 
     @action(detail=True, methods=['post'])
     def update_members(self, request, pk=None):
-        print("Request data:", request.data)
-        
         group = self.get_object()
-        member_ids = request.data.get('members', [])
-        
-        # Validate all user IDs exist
-        existing_users = User.objects.filter(id__in=member_ids).values_list('id', flat=True)
-        invalid_ids = set(member_ids) - set(existing_users)
-        
-        if invalid_ids:
+        try:
+            result = sync_group_members(group, request.data.get('members', []), actor=request.user)
+        except ValidationError as e:
             return Response(
-                {'error': f'Invalid user IDs: {invalid_ids}'},
+                {'error': ' '.join(e.messages)},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Get current memberships
-        current_memberships = group.memberships.all()
-        current_member_ids = set(current_memberships.values_list('user_id', flat=True))
-        
-        # Determine changes
-        new_member_ids = set(member_ids) - current_member_ids
-        removed_member_ids = current_member_ids - set(member_ids)
-        
-        # Add new members
-        for user_id in new_member_ids:
-            print(f"Adding user {user_id} with role {group.role}")
-            GroupMembership.objects.create(
-                user_id=user_id,
-                group=group,
-                role=group.role  # Assign the group's single role
-            )
-        
-        # Remove old members
-        group.memberships.filter(user_id__in=removed_member_ids).delete()
-        
-        return Response({
-            'added': list(new_member_ids),
-            'removed': list(removed_member_ids),
-            'total_members': group.memberships.count()
-        })
+        return Response(result)
         @action(detail=True, methods=['get'])
         def members(self, request, pk=None):
             group = self.get_object()
-            memberships = group.memberships.select_related('user', 'role')
+            memberships = membership_summaries(group.memberships.all())
             serializer = GroupMembershipSerializer(memberships, many=True)
             return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def members(self, request, pk=None):
+        """The group's roster, in keyset pages (?cursor=, ?page_size=, ?count=exact)."""
         group = self.get_object()
-        memberships = group.memberships.select_related('user', 'role')
-        serializer = GroupMembershipSerializer(memberships, many=True)
-        return Response(serializer.data)
+        paginator = RosterPagination()
+        page = paginator.paginate_queryset(membership_summaries(group.memberships.all()), request, view=self)
+        serializer = GroupMembershipSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='members/export')
+    def export_members(self, request, pk=None):
+        """The whole roster as CSV, streamed straight from a database cursor."""
+        group = self.get_object()
+        rows = group.memberships.order_by('id').values_list(*ROSTER_EXPORT_FIELDS)
+        writer = csv.writer(Echo())
+
+        def stream():
+            yield writer.writerow(ROSTER_EXPORT_HEADER)
+            for row in rows.iterator(chunk_size=ROSTER_EXPORT_CHUNK_SIZE):
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(stream(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="group-{group.pk}-members.csv"'
+        return response
 
     @action(detail=False, methods=['get'], url_path='by-name/(?P<name>[^/.]+)/members')
     def members_by_name(self, request, name=None):
@@ -159,7 +182,7 @@ class GroupViewSet(viewsets.ModelViewSet):
 
         try:
             group = Group.objects.prefetch_related(
-                Prefetch('memberships', queryset=GroupMembership.objects.select_related('user', 'role'))
+                Prefetch('memberships', queryset=membership_summaries())
             ).get(name__iexact=name)
         except Group.DoesNotExist:
             raise NotFound(f'Group with name "{name}" not found')
@@ -169,7 +192,7 @@ class GroupViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 class GroupMembershipViewSet(viewsets.ModelViewSet):
-    queryset = GroupMembership.objects.select_related('user', 'group', 'role')
+    queryset = membership_summaries(GroupMembership.objects.select_related('group'))
     serializer_class = GroupMembershipSerializer
     permission_classes = [AllowAny]
     # permission_classes = [permissions.IsAdminUser]
@@ -180,7 +203,8 @@ class GroupMembershipViewSet(viewsets.ModelViewSet):
         
         user_email = self.request.query_params.get('user_email', None)
         if user_email:
-            queryset = queryset.filter(user__email__icontains=user_email)
+            matches = search_users(User.objects.all(), user_email, fields=('email',))
+            queryset = queryset.filter(user__in=matches.values('pk'))
             
         return queryset
 
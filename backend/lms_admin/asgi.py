@@ -16,17 +16,17 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lms_admin.settings')
 application = get_asgi_application()
 # lms_admin/asgi.py
 import os
-from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 
 import messaging.routing
+from messaging.middleware import JWTAuthMiddlewareStack
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lms_admin.settings')
 
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
+    "websocket": JWTAuthMiddlewareStack(
         URLRouter(
             messaging.routing.websocket_urlpatterns
         )
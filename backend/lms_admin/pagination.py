@@ -0,0 +1,134 @@
+# lms_admin/pagination.py
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from metrics.counts import estimate_count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a (timestamp, id) ordering. Each page is
+    an indexed range scan from the previous page's last row, so deep pages
+    cost the same as the first and no COUNT(*) runs unless asked for with
+    ``?count=approx`` (planner estimate) or ``?count=exact``.
+
+    Views pick the ordering with ``keyset_ordering``, e.g.
+    ``('-timestamp', '-id')``; the last field must be unique.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-timestamp', '-id')
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor, fields):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(fields, values)]
+        except Exception:
+            raise NotFound('Invalid cursor')
+
+    def _seek_filter(self, ordering, values):
+        """
+        (a, b) < (x, y) expanded into ORs so any backend (and mixed sort
+        directions) can evaluate it, plus the redundant ``a <= x`` that
+        gives the planner a range bound on the index's leading column;
+        without it deep pages scan from the start of the index.
+        """
+        condition = Q()
+        for position, name in enumerate(ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            step = Q(**{f'{field}__{lookup}': values[position]})
+            for previous in range(position):
+                step &= Q(**{ordering[previous].lstrip('-'): values[previous]})
+            condition |= step
+        leading = ordering[0].lstrip('-')
+        bound = 'lte' if ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{leading}__{bound}': values[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering_fields = self.get_ordering(view)
+        self.page_size_value = self.get_page_size(request)
+        model_fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering_fields]
+
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            self.count = queryset.count()
+        elif count_mode == 'approx':
+            self.count = estimate_count(queryset)
+        else:
+            self.count = None
+
+        queryset = queryset.order_by(*self.ordering_fields)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = self.decode_cursor(cursor, model_fields)
+            queryset = queryset.filter(self._seek_filter(self.ordering_fields, values))
+
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        self.next_cursor = None
+        if self.has_next and self.page:
+            last = self.page[-1]
+            self.next_cursor = self.encode_cursor([field.value_to_string(last) for field in model_fields])
+        return self.page
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_first_link(self):
+        url = self.request.build_absolute_uri()
+        return remove_query_param(url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'links': {
+                'next': self.get_next_link(),
+                'first': self.get_first_link(),
+            },
+            'next': self.get_next_link(),
+            'count': self.count,
+            'page_size': self.page_size_value,
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'count': {'type': 'integer', 'nullable': True},
+                'page_size': {'type': 'integer'},
+                'results': schema,
+            },
+        }
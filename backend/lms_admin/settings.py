@@ -42,6 +42,8 @@ INSTALLED_APPS = [
     'advert',
     'groups',
     'forum',
+    'filestore',
+    'metrics',
     
 
     'courses',
@@ -69,7 +71,7 @@ ROOT_URLCONF = 'lms_admin.urls'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.SnapshotJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',  # Optional, for admin interface
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -87,6 +89,16 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Shared by every worker: role registry versions, auth snapshots and other
+# cross-process invalidation depend on it (a per-process LocMemCache would
+# leave the other workers stale)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+    },
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -127,9 +139,26 @@ CORS_ALLOWED_ORIGINS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are hashed chunk by chunk for content-addressed storage (filestore)
+FILE_UPLOAD_HANDLERS = [
+    'filestore.uploadhandlers.HashingMemoryFileUploadHandler',
+    'filestore.uploadhandlers.HashingTemporaryFileUploadHandler',
+]
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
+# Activity log retention in days per activity_type ('default' covers the rest);
+# expired rows are archived as gzipped NDJSON by `manage.py archive_activity`
+ACTIVITY_RETENTION_DAYS = {
+    'default': 365,
+    'login': 90,
+    'message_read': 90,
+}
+ACTIVITY_ARCHIVE_DIR = os.path.join(BASE_DIR, 'archives', 'activity')
+# Login activity rows are batched by a background writer (users/activity.py)
+ACTIVITY_DEFERRED_WRITES = True
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -210,6 +239,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: cost is tunable, work runs in a process pool (users/hashing.py)
+PASSWORD_HASHERS = [
+    'users.hashing.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = 1_000_000
+# Bulk-imported passwords are hashed cheaper and upgraded on first login
+PASSWORD_BULK_HASH_ITERATIONS = 100_000
+PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)
+PASSWORD_HASH_TIMEOUT = 30
+
 
 LANGUAGE_CODE = 'en-us'
 
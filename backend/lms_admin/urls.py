@@ -22,6 +22,7 @@ urlpatterns = [
     path('assessments/', include('assessments.urls')),
     path('forums/api/', include('forum.urls')),
     path('quality/api/', include('quality.urls')),
+    path('filestore/api/', include('filestore.urls')),
     
 
     path('payments/', include('payments.urls')),
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class MessagingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'messaging'
+
+    def ready(self):
+        from filestore.access import register_blob_access
+        from .models import MessageAttachment, visible_attachments
+        register_blob_access(MessageAttachment, visible_attachments)
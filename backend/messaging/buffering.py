@@ -0,0 +1,102 @@
+# messaging/buffering.py
+import asyncio
+import time
+from collections import deque
+
+COALESCE_WINDOW = 0.05  # seconds events wait for company before a frame goes out
+MAX_QUEUE = 100  # events held per connection before the oldest are dropped
+
+
+class SendLatency:
+    """Enqueue-to-send latency for one connection, in milliseconds."""
+
+    def __init__(self):
+        self.frames = 0
+        self.events = 0
+        self.dropped = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, enqueued_at, sent_at):
+        latency = (sent_at - enqueued_at) * 1000
+        self.events += 1
+        self.total_ms += latency
+        self.max_ms = max(self.max_ms, latency)
+        self.last_ms = latency
+
+    def as_dict(self):
+        return {
+            'frames': self.frames,
+            'events': self.events,
+            'dropped': self.dropped,
+            'avg_ms': round(self.total_ms / self.events, 3) if self.events else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'last_ms': round(self.last_ms, 3),
+        }
+
+
+class OutboundBuffer:
+    """
+    Per-connection outbound queue. Events arriving within COALESCE_WINDOW
+    are sent as one ``batch`` frame; a lone event keeps its original frame
+    shape. The queue is bounded: when a slow client lets it fill, the
+    oldest events are dropped and the next frame reports how many were
+    lost so the client can resync from the REST inbox.
+    """
+
+    def __init__(self, send, window=COALESCE_WINDOW, max_queue=MAX_QUEUE):
+        self._send = send
+        self.window = window
+        self.queue = deque()
+        self.max_queue = max_queue
+        self.metrics = SendLatency()
+        self._pending_drops = 0
+        self._flush_task = None
+        self._scheduled = False
+        self._lock = asyncio.Lock()
+
+    def push(self, payload):
+        if len(self.queue) >= self.max_queue:
+            self.queue.popleft()
+            self._pending_drops += 1
+            self.metrics.dropped += 1
+        self.queue.append((time.monotonic(), payload))
+        if not self._scheduled:
+            self._scheduled = True
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        # Events pushed from here on schedule the next frame
+        self._scheduled = False
+        await self.flush()
+
+    async def flush(self):
+        # The lock keeps frames ordered when a slow send overlaps the next window
+        async with self._lock:
+            if not self.queue:
+                return
+            items = list(self.queue)
+            self.queue.clear()
+            dropped, self._pending_drops = self._pending_drops, 0
+
+            if len(items) == 1 and not dropped:
+                frame = items[0][1]
+            else:
+                frame = {
+                    'type': 'batch',
+                    'events': [payload for _, payload in items],
+                    'dropped': dropped,
+                }
+            await self._send(frame)
+
+            sent_at = time.monotonic()
+            self.metrics.frames += 1
+            for enqueued_at, _ in items:
+                self.metrics.record(enqueued_at, sent_at)
+
+    async def close(self):
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self.queue.clear()
@@ -1,11 +1,18 @@
 # messaging/consumers.py
+import asyncio
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from .models import MessageRecipient
+from .presence import HEARTBEAT_INTERVAL, get_presence
+from .buffering import OutboundBuffer
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 class MessageConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.user = self.scope['user']
@@ -17,7 +24,10 @@ class MessageConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 self.channel_name
             )
+            self.outbound = OutboundBuffer(self.send_json)
             await self.accept()
+            await sync_to_async(get_presence().connect)(self.user.id, self.channel_name)
+            self.heartbeat = asyncio.ensure_future(self.keep_presence())
 
     async def disconnect(self, close_code):
         if hasattr(self, 'group_name'):
@@ -25,30 +35,56 @@ class MessageConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 self.channel_name
             )
+            if hasattr(self, 'heartbeat'):
+                self.heartbeat.cancel()
+            await sync_to_async(get_presence().disconnect)(self.user.id, self.channel_name)
+        if hasattr(self, 'outbound'):
+            await self.outbound.close()
+            logger.info("Websocket closed for user %s: %s", self.user.id, self.outbound.metrics.as_dict())
 
     async def receive(self, text_data):
         text_data_json = json.loads(text_data)
+        await sync_to_async(get_presence().touch)(self.user.id)
         message_type = text_data_json.get('type')
         
         if message_type == 'mark_as_read':
             message_id = text_data_json.get('message_id')
             await self.mark_message_as_read(message_id)
+        elif message_type == 'get_metrics':
+            await self.send_json({
+                'type': 'metrics',
+                'send_latency': self.outbound.metrics.as_dict(),
+                'queued': len(self.outbound.queue),
+            })
+
+    async def keep_presence(self):
+        # Listen-only clients never call receive(); keep their entry live
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            try:
+                await sync_to_async(get_presence().heartbeat)(self.user.id, self.channel_name)
+            except Exception:
+                logger.exception("Presence heartbeat failed for user %s", self.user.id)
+
+    async def send_json(self, content):
+        await self.send(text_data=json.dumps(content))
 
     async def new_message(self, event):
-        await self.send(text_data=json.dumps({
+        # Buffered so bursts (e.g. group broadcasts) go out as one frame
+        self.outbound.push({
             'type': 'new_message',
             'message': event['message']
-        }))
+        })
 
     async def message_read(self, event):
-        await self.send(text_data=json.dumps({
+        self.outbound.push({
             'type': 'message_read',
             'message_id': event['message_id']
-        }))
+        })
 
     @database_sync_to_async
     def mark_message_as_read(self, message_id):
         MessageRecipient.objects.filter(
             message_id=message_id,
-            recipient=self.user
+            recipient_id=self.user.id
         ).update(read=True, read_at=timezone.now())
\ No newline at end of file
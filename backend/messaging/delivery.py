@@ -0,0 +1,58 @@
+# messaging/delivery.py
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from groups.membership_cache import members_of_groups
+from .models import MessageRecipient
+from .presence import get_presence
+
+logger = logging.getLogger(__name__)
+
+
+def recipient_user_ids(message):
+    """Direct recipients plus active members of recipient groups (from the membership cache)."""
+    direct = set()
+    group_ids = set()
+    for user_id, group_id in MessageRecipient.objects.filter(message=message).values_list(
+        'recipient_id', 'recipient_group_id'
+    ):
+        direct.add(user_id)
+        group_ids.add(group_id)
+    direct.discard(None)
+    group_ids.discard(None)
+    return (direct | members_of_groups(group_ids)) - {message.sender_id}
+
+
+def message_event(message):
+    return {
+        'id': message.id,
+        'subject': message.subject,
+        'sender_id': message.sender_id,
+        'sent_at': message.sent_at.isoformat(),
+        'is_forward': message.is_forward,
+    }
+
+
+async def _send_to_users(channel_layer, user_ids, event):
+    for user_id in user_ids:
+        await channel_layer.group_send(f'user_{user_id}', event)
+
+
+def deliver_message(message):
+    """
+    Push a new-message event to the websocket of every online recipient.
+    Offline users are skipped; they pick the message up from the REST inbox.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    user_ids = recipient_user_ids(message)
+    event = {'type': 'new_message', 'message': message_event(message)}
+    try:
+        online = get_presence().online(user_ids)
+        if online:
+            async_to_sync(_send_to_users)(channel_layer, sorted(online), event)
+    except Exception:
+        logger.exception("Websocket delivery failed for message %s", message.id)
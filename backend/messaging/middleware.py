@@ -0,0 +1,87 @@
+# messaging/middleware.py
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+class SocketUser(TokenUser):
+    """
+    Token-backed user for websocket connections. Identity comes from the
+    verified access token, profile claims from the cached user snapshot
+    shared with the REST API (users.authentication).
+    """
+
+    def __init__(self, token, claims):
+        super().__init__(token)
+        self.claims = claims
+
+    @property
+    def email(self):
+        return self.claims['email']
+
+    @property
+    def role(self):
+        return self.claims['role']
+
+    @property
+    def status(self):
+        return self.claims['status']
+
+    @property
+    def is_staff(self):
+        return self.claims['is_staff']
+
+    @property
+    def is_superuser(self):
+        return self.claims['is_superuser']
+
+
+@database_sync_to_async
+def load_claims(user_id):
+    from users.authentication import get_user_snapshot
+
+    return get_user_snapshot(user_id)
+
+
+async def get_user_for_token(raw_token):
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return AnonymousUser()
+
+    # Cache hits never reach the database
+    claims = await load_claims(token.get('user_id'))
+    if claims is None or not claims['is_active'] or claims['status'] in ('suspended', 'deleted'):
+        return AnonymousUser()
+    return SocketUser(token, claims)
+
+
+def token_from_scope(scope):
+    """Browsers cannot set headers on websockets, so accept ?token= as well."""
+    query = parse_qs(scope.get('query_string', b'').decode())
+    if query.get('token'):
+        return query['token'][0]
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] == 'Bearer':
+                return parts[1]
+    return None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Authenticate websocket connections with the same JWTs as the REST API."""
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        raw_token = token_from_scope(scope)
+        scope['user'] = await get_user_for_token(raw_token) if raw_token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    return JWTAuthMiddleware(inner)
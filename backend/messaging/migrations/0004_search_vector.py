@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-19 10:58
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS messaging_message_search_gin "
+        "ON messaging_message USING gin (search_vector)"
+    )
+    # Backfill existing rows; new rows are maintained by Message.save.
+    schema_editor.execute(
+        "UPDATE messaging_message m SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(m.subject, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(m.content, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(u.first_name, '') || ' ' || "
+        "coalesce(u.last_name, '') || ' ' || coalesce(u.email, '')), 'C') "
+        "FROM users_user u WHERE u.id = m.sender_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS messaging_message_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_alter_message_message_type'),
+        ('users', '0004_alter_useractivity_activity_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
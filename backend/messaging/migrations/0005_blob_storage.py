@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 11:02
+
+import filestore.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0004_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='messageattachment',
+            name='file',
+            field=models.FileField(storage=filestore.storage.blob_storage, upload_to='message_attachments/'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 11:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_blob_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['-sent_at', '-id'], name='messaging_m_sent_at_b9bcbd_idx'),
+        ),
+    ]
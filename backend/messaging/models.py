@@ -1,7 +1,11 @@
 # messaging/models.py
 from django.db import models
+from django.db.models import Q
+from django.contrib.postgres.search import SearchVectorField
 from users.models import User, UserActivity
 from groups.models import Group  
+from .search import update_search_vector
+from filestore.storage import blob_storage
 
 class MessageType(models.Model):
     value = models.CharField(max_length=50, unique=True)
@@ -18,12 +22,14 @@ class MessageType(models.Model):
             UserActivity.objects.create(
                 activity_type='message_type_created',
                 details=f'Message type "{self.label}" created',
+                target=self,
                 status='success'
             )
         else:
             UserActivity.objects.create(
                 activity_type='message_type_updated',
                 details=f'Message type "{self.label}" updated',
+                target=self,
                 status='success'
             )
 
@@ -34,6 +40,10 @@ class MessageType(models.Model):
         return self.label
 
 
+# Columns the stored search_vector is built from
+SEARCH_SOURCE_FIELDS = ('subject', 'content', 'sender_id')
+
+
 class Message(models.Model):
     message_type = models.ForeignKey(
             MessageType,
@@ -68,16 +78,41 @@ class Message(models.Model):
         related_name='replies'
     )
     is_forward = models.BooleanField(default=False)
+    # Maintained by Message.save via messaging.search; GIN-indexed on Postgres
+    # (see migration 0004, the index is skipped on other backends).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-sent_at']
+        indexes = [
+            models.Index(fields=['-sent_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.sender.email}: {self.subject}"
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._indexed_source = instance._search_source()
+        return instance
+
+    def _search_source(self):
+        # Deferred fields are absent from __dict__ and compare as unchanged
+        return tuple(self.__dict__.get(attname) for attname in SEARCH_SOURCE_FIELDS)
+
+    def _search_source_changed(self, update_fields):
+        if update_fields is not None and not {'subject', 'content', 'sender', 'sender_id'} & set(update_fields):
+            return False
+        return self._search_source() != getattr(self, '_indexed_source', None)
+
     def save(self, *args, **kwargs):
         is_new = self.pk is None
+        reindex = is_new or self._search_source_changed(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
+        if reindex:
+            update_search_vector(self)
+            self._indexed_source = self._search_source()
         
         # Log activity
         if is_new:
@@ -91,6 +126,7 @@ class Message(models.Model):
             user=self.sender,
             activity_type=activity_type,
             details=details,
+            target=self,
             status='success'
         )
 
@@ -100,6 +136,8 @@ class Message(models.Model):
             user=self.sender,
             activity_type='message_deleted',
             details=f'Message "{self.subject}" deleted',
+            target=self,
+            payload={'subject': self.subject},
             status='success'
         )
         super().delete(*args, **kwargs)
@@ -146,6 +184,7 @@ class MessageRecipient(models.Model):
                     user=self.recipient if self.recipient else None,
                     activity_type='message_read',
                     details=f'Marked message "{self.message.subject}" as read',
+                    target=self.message,
                     status='success'
                 )
 
@@ -155,7 +194,7 @@ class MessageAttachment(models.Model):
         on_delete=models.CASCADE,
         related_name='attachments'
     )
-    file = models.FileField(upload_to='message_attachments/')
+    file = models.FileField(upload_to='message_attachments/', storage=blob_storage)
     original_filename = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
@@ -171,6 +210,19 @@ class MessageAttachment(models.Model):
                 user=self.message.sender,
                 activity_type='message_attachment_added',
                 details=f'Added attachment "{self.original_filename}" to message "{self.message.subject}"',
+                target=self.message,
+                payload={'attachment_id': self.pk, 'filename': self.original_filename},
                 status='success'
             )
 
+
+def visible_attachments(queryset, user):
+    """Attachments on messages the user sent or received, directly or through an active group."""
+    return queryset.filter(
+        Q(message__sender=user)
+        | Q(message__recipients__recipient=user)
+        | Q(
+            message__recipients__recipient_group__memberships__user=user,
+            message__recipients__recipient_group__memberships__is_active=True
+        )
+    )
@@ -0,0 +1,143 @@
+# messaging/presence.py
+import threading
+import time
+
+from django.conf import settings
+
+HEARTBEAT_INTERVAL = 60  # seconds between a consumer's presence refreshes
+# A connection that missed this many seconds of heartbeats (its worker died)
+# no longer counts as live
+PRESENCE_TTL = 3 * HEARTBEAT_INTERVAL
+KEY_PREFIX = 'presence'
+
+
+class LocalPresence:
+    """
+    In-process stand-in used when the channel layer is not Redis
+    (development, tests). Only sees connections held by this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._last_seen = {}
+
+    def connect(self, user_id, connection_id):
+        with self._lock:
+            self._connections.setdefault(user_id, {})[connection_id] = time.time() + PRESENCE_TTL
+            self._last_seen[user_id] = time.time()
+
+    def heartbeat(self, user_id, connection_id):
+        with self._lock:
+            connections = self._connections.get(user_id)
+            if connections is not None and connection_id in connections:
+                connections[connection_id] = time.time() + PRESENCE_TTL
+
+    def disconnect(self, user_id, connection_id):
+        with self._lock:
+            connections = self._connections.get(user_id, {})
+            connections.pop(connection_id, None)
+            if not connections:
+                self._connections.pop(user_id, None)
+            self._last_seen[user_id] = time.time()
+
+    def touch(self, user_id):
+        with self._lock:
+            self._last_seen[user_id] = time.time()
+
+    def connection_count(self, user_id):
+        now = time.time()
+        return sum(1 for expires in self._connections.get(user_id, {}).values() if expires > now)
+
+    def last_seen(self, user_id):
+        return self._last_seen.get(user_id)
+
+    def online(self, user_ids):
+        return {user_id for user_id in user_ids if self.connection_count(user_id) > 0}
+
+
+class RedisPresence:
+    """
+    Presence shared by every worker, kept in the channel layer's Redis.
+    Each user has a sorted set of their open connections scored by expiry
+    time. Consumers refresh their own entry every HEARTBEAT_INTERVAL, so a
+    connection that only listens stays live, while entries left behind by
+    a crashed worker lapse after PRESENCE_TTL without disturbing the
+    user's other connections.
+    """
+
+    def __init__(self, host):
+        import redis
+
+        if isinstance(host, dict):
+            self.client = redis.Redis.from_url(host['address']) if 'address' in host else redis.Redis(**host)
+        elif isinstance(host, str):
+            self.client = redis.Redis.from_url(host)
+        else:
+            self.client = redis.Redis(host=host[0], port=host[1])
+
+    def _connections_key(self, user_id):
+        return f'{KEY_PREFIX}:conns:{user_id}'
+
+    def _seen_key(self, user_id):
+        return f'{KEY_PREFIX}:seen:{user_id}'
+
+    def _refresh(self, pipe, user_id, connection_id):
+        key = self._connections_key(user_id)
+        now = time.time()
+        pipe.zadd(key, {connection_id: now + PRESENCE_TTL})
+        pipe.zremrangebyscore(key, '-inf', now)
+        pipe.expire(key, PRESENCE_TTL)
+
+    def connect(self, user_id, connection_id):
+        pipe = self.client.pipeline()
+        self._refresh(pipe, user_id, connection_id)
+        pipe.set(self._seen_key(user_id), time.time())
+        pipe.execute()
+
+    def heartbeat(self, user_id, connection_id):
+        pipe = self.client.pipeline()
+        self._refresh(pipe, user_id, connection_id)
+        pipe.execute()
+
+    def disconnect(self, user_id, connection_id):
+        pipe = self.client.pipeline()
+        pipe.zrem(self._connections_key(user_id), connection_id)
+        pipe.set(self._seen_key(user_id), time.time())
+        pipe.execute()
+
+    def touch(self, user_id):
+        self.client.set(self._seen_key(user_id), time.time())
+
+    def connection_count(self, user_id):
+        return self.client.zcount(self._connections_key(user_id), time.time(), '+inf')
+
+    def last_seen(self, user_id):
+        value = self.client.get(self._seen_key(user_id))
+        return float(value) if value else None
+
+    def online(self, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        now = time.time()
+        pipe = self.client.pipeline()
+        for user_id in user_ids:
+            pipe.zcount(self._connections_key(user_id), now, '+inf')
+        return {user_id for user_id, count in zip(user_ids, pipe.execute()) if count}
+
+
+_presence = None
+
+
+def get_presence():
+    """Presence registry matching the configured channel layer."""
+    global _presence
+    if _presence is None:
+        layer = settings.CHANNEL_LAYERS.get('default', {})
+        hosts = layer.get('CONFIG', {}).get('hosts')
+        if layer.get('BACKEND', '').startswith('channels_redis') and hosts:
+            _presence = RedisPresence(hosts[0])
+        else:
+            _presence = LocalPresence()
+    return _presence
@@ -0,0 +1,149 @@
+# messaging/search.py
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Value, When
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+SEARCH_CONFIG = 'english'
+
+
+def tokenize(text):
+    """Lower-cased word tokens, shared by the tsquery builder and the fallback index."""
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def build_search_vector(message):
+    """
+    tsvector expression for a message: subject weighted above the body,
+    sender identity last so that name/email matches still surface.
+    """
+    sender = message.sender
+    sender_text = f"{sender.first_name} {sender.last_name} {sender.email}"
+    return (
+        SearchVector(Value(message.subject), weight='A', config=SEARCH_CONFIG) +
+        SearchVector(Value(message.content), weight='B', config=SEARCH_CONFIG) +
+        SearchVector(Value(sender_text), weight='C', config='simple')
+    )
+
+
+def update_search_vector(message):
+    """Refresh the stored tsvector for a single message (no-op off Postgres)."""
+    if not uses_postgres_search():
+        return
+    from .models import Message
+    Message.objects.filter(pk=message.pk).update(search_vector=build_search_vector(message))
+
+
+def build_prefix_query(terms):
+    """Every term must match; the last one may be a prefix (search-as-you-type)."""
+    tokens = tokenize(terms)
+    if not tokens:
+        return None
+    parts = [f"{token}:*" for token in tokens]
+    return SearchQuery(' & '.join(parts), search_type='raw', config=SEARCH_CONFIG)
+
+
+class InvertedIndex:
+    """
+    Small in-memory inverted index used when the database has no full-text
+    support (SQLite test runs). Built per query from the already scoped inbox,
+    so it never sees messages the user cannot read.
+    """
+    FIELD_WEIGHTS = {'subject': 1.0, 'content': 0.4, 'sender': 0.2}
+
+    def __init__(self):
+        self.postings = defaultdict(lambda: defaultdict(float))
+        self.doc_count = 0
+        self._terms = None
+
+    def add(self, doc_id, fields):
+        self.doc_count += 1
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS.get(field, 0.1)
+            for token in tokenize(text):
+                self.postings[token][doc_id] += weight
+        self._terms = None
+
+    def _expand(self, token):
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        start = bisect_left(self._terms, token)
+        matches = []
+        for term in self._terms[start:]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        return matches
+
+    def search(self, terms):
+        """Return [(doc_id, score)] ranked best first; all terms must match."""
+        tokens = tokenize(terms)
+        if not tokens:
+            return []
+        scores = None
+        for token in tokens:
+            token_scores = defaultdict(float)
+            for term in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + self.doc_count / len(postings))
+                for doc_id, tf in postings.items():
+                    token_scores[doc_id] += tf * idf
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    doc_id: score + token_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in token_scores
+                }
+            if not scores:
+                return []
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+def _fallback_search(queryset, terms):
+    index = InvertedIndex()
+    rows = queryset.order_by().values_list(
+        'id', 'subject', 'content',
+        'sender__email', 'sender__first_name', 'sender__last_name'
+    ).distinct()
+    for pk, subject, content, email, first_name, last_name in rows:
+        index.add(pk, {
+            'subject': subject,
+            'content': content,
+            'sender': f"{first_name} {last_name} {email}",
+        })
+    ranked = [pk for pk, _ in index.search(terms)]
+    if not ranked:
+        return queryset.none()
+    ordering = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked)],
+        output_field=IntegerField()
+    )
+    return queryset.filter(pk__in=ranked).annotate(search_position=ordering).order_by('search_position')
+
+
+def search_messages(queryset, terms):
+    """
+    Rank ``queryset`` (already scoped to the user's inbox) against ``terms``
+    with prefix matching. Uses the GIN-indexed tsvector on Postgres and the
+    in-memory inverted index elsewhere.
+    """
+    if not uses_postgres_search():
+        return _fallback_search(queryset, terms)
+
+    query = build_prefix_query(terms)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query)
+    ).order_by('-rank', '-sent_at')
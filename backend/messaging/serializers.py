@@ -1,12 +1,13 @@
 # messaging/serializers.py
 from rest_framework import serializers
 from .models import Message, MessageRecipient, MessageAttachment, MessageType
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer
 from groups.serializers import GroupSerializer
 from django.utils import timezone
 from django.db.models import Q
 from users.models import User
 from groups.models import Group
+from groups.membership_cache import user_group_ids
 
 class MessageTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -36,7 +37,7 @@ class MessageAttachmentSerializer(serializers.ModelSerializer):
         return None
 
 class MessageRecipientSerializer(serializers.ModelSerializer):
-    recipient = UserSerializer(read_only=True)
+    recipient = UserSummarySerializer(read_only=True)
     recipient_group = GroupSerializer(read_only=True)
     
     class Meta:
@@ -45,7 +46,7 @@ class MessageRecipientSerializer(serializers.ModelSerializer):
 
 class MessageSerializer(serializers.ModelSerializer):
     message_type = serializers.PrimaryKeyRelatedField(queryset=MessageType.objects.all())
-    sender = UserSerializer(read_only=True)
+    sender = UserSummarySerializer(read_only=True)
     message_type_display = serializers.CharField(source='message_type.label', read_only=True)
     sender_display = serializers.SerializerMethodField(read_only=True)
     recipients = MessageRecipientSerializer(many=True, read_only=True)
@@ -84,10 +85,19 @@ class MessageSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return None
         # Check if current user has read this message
-        recipient = obj.recipients.filter(
-            Q(recipient=request.user) | 
-            Q(recipient_group__memberships__user=request.user)  # Corrected line
-        ).first()
+        if 'recipients' in getattr(obj, '_prefetched_objects_cache', {}):
+            # Resolved from the prefetched rows (see with_message_details)
+            user_id = request.user.pk
+            group_ids = user_group_ids(user_id)
+            recipient = next((
+                r for r in sorted(obj.recipients.all(), key=lambda r: r.pk)
+                if r.recipient_id == user_id or r.recipient_group_id in group_ids
+            ), None)
+        else:
+            recipient = obj.recipients.filter(
+                Q(recipient=request.user) | 
+                Q(recipient_group__in=user_group_ids(request.user.pk))
+            ).first()
         return recipient.read if recipient else None
     
     def get_sender_display(self, obj):
@@ -120,4 +130,38 @@ class MessageSerializer(serializers.ModelSerializer):
             )
         
         return message
-    
\ No newline at end of file
+    
+
+class ForwardMessageSerializer(serializers.Serializer):
+    """
+    Recipients are validated with a single query per model instead of
+    one lookup per primary key, so forwarding cost does not grow with
+    the recipient list.
+    """
+    subject = serializers.CharField(max_length=200)
+    content = serializers.CharField(allow_blank=True)
+    recipient_users = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+    recipient_groups = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+    def _resolve(self, model, ids, label):
+        ids = list(dict.fromkeys(ids))
+        found = {obj.pk: obj for obj in model.objects.filter(pk__in=ids)}
+        missing = [pk for pk in ids if pk not in found]
+        if missing:
+            raise serializers.ValidationError(f"Invalid {label} ids: {missing}")
+        return [found[pk] for pk in ids]
+
+    def validate_recipient_users(self, value):
+        return self._resolve(User, value, 'user')
+
+    def validate_recipient_groups(self, value):
+        return self._resolve(Group, value, 'group')
+
+    def validate(self, attrs):
+        if not attrs.get('recipient_users') and not attrs.get('recipient_groups'):
+            raise serializers.ValidationError("At least one recipient is required")
+        return attrs
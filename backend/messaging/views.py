@@ -2,16 +2,26 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
+from lms_admin.pagination import KeysetPagination
+from metrics.counts import APPROX, register_count, read_counts, wants_exact
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from groups.models import Group
-from django.db.models import Q
+from groups.membership_cache import user_group_ids
+from groups.serializers import groups_with_member_counts
+from users.serializers import with_user_summaries
+from django.db import transaction
+from django.db.models import Prefetch, Q
 from datetime import datetime, timedelta
 from .models import Message, MessageRecipient, MessageAttachment, MessageType
 from .serializers import (MessageSerializer, MessageAttachmentSerializer,MessageTypeSerializer,
-    # ForwardMessageSerializer, ReplyMessageSerializer
+    ForwardMessageSerializer, # ReplyMessageSerializer
 )
 from users.models import UserActivity
+from .search import search_messages
+from .delivery import deliver_message
+from filestore.storage import retain_blobs
 
 class MessageTypeViewSet(viewsets.ModelViewSet):
     queryset = MessageType.objects.all()
@@ -32,18 +42,41 @@ class MessageTypeViewSet(viewsets.ModelViewSet):
         # Logic to set as default message type
         return Response({'status': 'default set'})
 
+MESSAGE_STAT_COUNTS = [
+    register_count('messages.total', lambda: Message.objects.all(), mode=APPROX),
+]
+
+
+def with_message_details(queryset):
+    """Everything MessageSerializer renders, with nested users as summaries."""
+    recipients = with_user_summaries(MessageRecipient.objects.all(), 'recipient')
+    return with_user_summaries(queryset.select_related('message_type'), 'sender').prefetch_related(
+        Prefetch('recipients', queryset=recipients),
+        Prefetch('recipients__recipient_group', queryset=groups_with_member_counts()),
+        'attachments',
+    )
+
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-sent_at', '-id')
+
+    def paginate_queryset(self, queryset):
+        if self.request.query_params.get('search'):
+            # Ranked search results keep relevance order, paged by number
+            self._paginator = PageNumberPagination()
+        return super().paginate_queryset(queryset)
         
     def get_queryset(self):
         user = self.request.user
         print("Checking recipient groups for user:", user)
 
+        group_ids = user_group_ids(user.pk)
         queryset = Message.objects.filter(
             Q(sender=user) | 
             Q(recipients__recipient=user) |
-            Q(recipients__recipient_group__memberships__user=user)  # Corrected line
+            Q(recipients__recipient_group__in=group_ids)
         ).distinct().order_by('-sent_at')
 
         # Rest of your filtering logic remains the same
@@ -58,14 +91,6 @@ class MessageViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(message_type=message_type)
         if status_filter and status_filter != 'all':
             queryset = queryset.filter(status=status_filter)
-        if search:
-            queryset = queryset.filter(
-                Q(subject__icontains=search) |
-                Q(content__icontains=search) |
-                Q(sender__email__icontains=search) |
-                Q(sender__first_name__icontains=search) |
-                Q(sender__last_name__icontains=search)
-            )
         if read_status and read_status != 'all':
             if read_status == 'read':
                 queryset = queryset.filter(
@@ -76,23 +101,26 @@ class MessageViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(
                     Q(recipients__read=False) &
                     (Q(recipients__recipient=user) | 
-                    Q(recipients__recipient_group__memberships__user=user))  # Corrected line
+                    Q(recipients__recipient_group__in=group_ids))
                 )
         if date_from:
             queryset = queryset.filter(sent_at__gte=date_from)
         if date_to:
             queryset = queryset.filter(sent_at__lte=date_to)
+        if search:
+            # Ranked full-text search over the already scoped inbox
+            queryset = search_messages(queryset, search)
             
-        return queryset
+        return with_message_details(queryset)
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         user = request.user
         count = MessageRecipient.objects.filter(
             Q(read=False) & (
                 Q(recipient=user) |
-                Q(recipient_group__memberships__user=user)
+                Q(recipient_group__in=user_group_ids(user.pk))
             )
-        ).distinct().count()
+        ).count()
         
         return Response({'count': count}, status=status.HTTP_200_OK)
     
@@ -102,13 +130,15 @@ class MessageViewSet(viewsets.ModelViewSet):
         return context
     
     def perform_create(self, serializer):
-        serializer.save(sender=self.request.user)
+        message = serializer.save(sender=self.request.user)
+        transaction.on_commit(lambda: deliver_message(message))
 
         # print(self.request.data)
         UserActivity.objects.create(
             user=self.request.user,
             activity_type='message_sent',
             details=f'{self.request.user} Sent message {self.request.data["subject"]}',
+            target=message,
             status='success'
         )
     
@@ -118,48 +148,52 @@ class MessageViewSet(viewsets.ModelViewSet):
         serializer = ForwardMessageSerializer(data=request.data)
         
         if serializer.is_valid():
-            forwarded_msg = Message.objects.create(
-                sender=request.user,
-                subject=serializer.validated_data['subject'],
-                content=serializer.validated_data['content'],
-                message_type=message.message_type,
-                parent_message=message,
-                is_forward=True
-            )
-            
-            # Add recipients
-            for user in serializer.validated_data['recipient_users']:
-                MessageRecipient.objects.create(
-                    message=forwarded_msg,
-                    recipient=user
-                )
-                UserActivity.objects.create(
-                    user=request.user,
-                    activity_type='message_forwarded',
-                    details=f'Forwarded message "{message.subject}" to {user.email}',
-                    status='success'
+            recipient_users = serializer.validated_data['recipient_users']
+            recipient_groups = serializer.validated_data['recipient_groups']
+
+            with transaction.atomic():
+                forwarded_msg = Message.objects.create(
+                    sender=request.user,
+                    subject=serializer.validated_data['subject'],
+                    content=serializer.validated_data['content'],
+                    message_type=message.message_type,
+                    parent_message=message,
+                    is_forward=True
                 )
-            
-            for group in serializer.validated_data.get('recipient_groups', []):
-                MessageRecipient.objects.create(
-                    message=forwarded_msg,
-                    recipient_group=group
+
+                # Add recipients in one insert
+                MessageRecipient.objects.bulk_create(
+                    [MessageRecipient(message=forwarded_msg, recipient=user) for user in recipient_users] +
+                    [MessageRecipient(message=forwarded_msg, recipient_group=group) for group in recipient_groups]
                 )
+
+                # Point at the same content-addressed blobs rather than copying them
+                attachments = MessageAttachment.objects.bulk_create([
+                    MessageAttachment(
+                        message=forwarded_msg,
+                        file=attachment.file.name,
+                        original_filename=attachment.original_filename
+                    )
+                    for attachment in message.attachments.all()
+                ])
+                retain_blobs(attachment.file.name for attachment in attachments)
+
+                targets = [user.email for user in recipient_users] + [f'group {group.name}' for group in recipient_groups]
                 UserActivity.objects.create(
                     user=request.user,
                     activity_type='message_forwarded',
-                    details=f'Forwarded message "{message.subject}" to group {group.name}',
+                    details=f'Forwarded message "{message.subject}" to {", ".join(targets)}',
+                    target=message,
+                    payload={
+                        'forwarded_message_id': forwarded_msg.pk,
+                        'recipient_ids': [user.pk for user in recipient_users],
+                        'group_ids': [group.pk for group in recipient_groups],
+                    },
                     status='success'
                 )
-            
-            # Copy attachments
-            for attachment in message.attachments.all():
-                MessageAttachment.objects.create(
-                    message=forwarded_msg,
-                    file=attachment.file,
-                    original_filename=attachment.original_filename
-                )
-            
+                transaction.on_commit(lambda: deliver_message(forwarded_msg))
+
+            forwarded_msg = with_message_details(Message.objects.all()).get(pk=forwarded_msg.pk)
             return Response(
                 self.get_serializer(forwarded_msg).data,
                 status=status.HTTP_201_CREATED
@@ -191,6 +225,8 @@ class MessageViewSet(viewsets.ModelViewSet):
                 user=request.user,
                 activity_type='message_replied',
                 details=f'Replied to message "{message.subject}"',
+                target=message,
+                payload={'reply_id': reply_msg.pk},
                 status='success'
             )
             
@@ -216,7 +252,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         
         # Mark as read for group recipients
         group_recipients = message.recipients.filter(
-            recipient_group__memberships__user=user  # Corrected line
+            recipient_group__in=user_group_ids(user.pk)
         )
         for recipient in group_recipients:
             recipient.read = True
@@ -228,6 +264,7 @@ class MessageViewSet(viewsets.ModelViewSet):
             user=user,
             activity_type='message_read',
             details=f'Marked message "{message.subject}" as read',
+            target=message,
             status='success'
         )
         
@@ -239,12 +276,11 @@ class MessageViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """General user statistics"""
-        total_messages = Message.objects.count()
-        
+        """General message statistics"""
+        counts = read_counts(MESSAGE_STAT_COUNTS, exact=wants_exact(request))
         
         return Response({
-            'total_messages': total_messages,
+            'total_messages': counts['messages.total'],
         })
     
 class MessageAttachmentViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,128 @@
+# metrics/counts.py
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+EXACT = 'exact'
+APPROX = 'approx'
+SNAPSHOT = 'snapshot'
+
+_registry = {}
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate on Postgres (pg_class.reltuples for a bare table,
+    EXPLAIN for a filtered queryset); exact COUNT elsewhere.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0]
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CountSpec:
+    """
+    A named dashboard count.
+
+    ``mode`` is how the number is served when the caller does not ask for
+    exact values: SNAPSHOT reads the CountSnapshot row and recomputes it
+    once it is older than ``max_age`` seconds; APPROX uses planner
+    estimates; EXACT always runs COUNT(*).
+    """
+
+    def __init__(self, key, queryset_factory, mode=SNAPSHOT, max_age=300):
+        self.key = key
+        self.queryset_factory = queryset_factory
+        self.mode = mode
+        self.max_age = max_age
+
+    def exact(self):
+        return self.queryset_factory().count()
+
+    def approximate(self):
+        return estimate_count(self.queryset_factory())
+
+
+def register_count(key, queryset_factory, mode=SNAPSHOT, max_age=300):
+    spec = CountSpec(key, queryset_factory, mode=mode, max_age=max_age)
+    _registry[key] = spec
+    return spec
+
+
+def registered_counts():
+    return dict(_registry)
+
+
+def refresh_snapshots(specs):
+    """Recompute and store exact values for the given specs."""
+    from .models import CountSnapshot
+
+    now = timezone.now()
+    values = {}
+    for spec in specs:
+        values[spec.key] = spec.exact()
+        CountSnapshot.objects.update_or_create(
+            key=spec.key,
+            defaults={'value': values[spec.key], 'refreshed_at': now}
+        )
+    return values
+
+
+def read_counts(specs, exact=False):
+    """
+    Resolve several counts at once: {key: value}. Fresh snapshots come from
+    a single query; stale or missing ones are recomputed and stored.
+    ``exact=True`` bypasses snapshots and estimates for this call.
+    """
+    from .models import CountSnapshot
+
+    if exact:
+        return {spec.key: spec.exact() for spec in specs}
+
+    values = {}
+    snapshot_specs = [spec for spec in specs if spec.mode == SNAPSHOT]
+    for spec in specs:
+        if spec.mode == EXACT:
+            values[spec.key] = spec.exact()
+        elif spec.mode == APPROX:
+            values[spec.key] = spec.approximate()
+
+    if snapshot_specs:
+        now = timezone.now()
+        snapshots = {
+            snapshot.key: snapshot
+            for snapshot in CountSnapshot.objects.filter(key__in=[spec.key for spec in snapshot_specs])
+        }
+        stale = []
+        for spec in snapshot_specs:
+            snapshot = snapshots.get(spec.key)
+            if snapshot and snapshot.refreshed_at >= now - timedelta(seconds=spec.max_age):
+                values[spec.key] = snapshot.value
+            else:
+                stale.append(spec)
+        values.update(refresh_snapshots(stale))
+
+    return values
+
+
+def wants_exact(request):
+    """Endpoints opt in to exact numbers with ?exact=true."""
+    return request.query_params.get('exact', '').lower() in ('1', 'true', 'yes')
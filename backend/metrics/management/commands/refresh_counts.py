@@ -0,0 +1,19 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from metrics.counts import refresh_snapshots, registered_counts, SNAPSHOT
+
+
+class Command(BaseCommand):
+    help = 'Recompute all snapshot-backed dashboard counts (run periodically)'
+
+    def handle(self, *args, **options):
+        # Counts are registered by the view modules; load them via the URLconf
+        import_module(settings.ROOT_URLCONF)
+        specs = [spec for spec in registered_counts().values() if spec.mode == SNAPSHOT]
+        values = refresh_snapshots(specs)
+        for key, value in sorted(values.items()):
+            self.stdout.write(f'{key}: {value}')
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {len(values)} count(s)'))
@@ -0,0 +1,15 @@
+# metrics/models.py
+from django.db import models
+
+
+class CountSnapshot(models.Model):
+    """Last computed value of a registered dashboard count (see metrics.counts)."""
+    key = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['key']
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
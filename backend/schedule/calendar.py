@@ -0,0 +1,52 @@
+# schedule/calendar.py
+"""
+Calendar queries: a user's events intersecting a [start, end) window.
+
+A user's events are the ones they created, are a direct participant of,
+or that include one of their groups (read from groups.membership_cache,
+so no membership join). Participation is tested with an EXISTS subquery
+rather than an OR across joins, which would need DISTINCT.
+
+The window test is written so each backend can use an index: on Postgres
+it is a range overlap (&&) matched by the GiST index on
+tstzrange(start_time, end_time, '[]') from migration 0003; elsewhere it is
+start_time < end AND end_time >= start over the (start_time, end_time)
+B-tree index. Both treat an event as the closed range [start_time,
+end_time], so zero-length events (reminders) are still found.
+"""
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import Exists, Func, OuterRef, Q
+
+from groups.membership_cache import user_group_ids
+
+from .models import ScheduleParticipant
+
+
+class Period(Func):
+    """tstzrange(start_time, end_time, '[]'); must match the GiST index expression."""
+    function = 'TSTZRANGE'
+    template = "%(function)s(%(expressions)s, '[]')"
+    output_field = DateTimeRangeField()
+
+
+def uses_range_index():
+    return connection.vendor == 'postgresql'
+
+
+def participant_filter(user):
+    """Q matching schedules ``user`` created or takes part in, directly or via a group."""
+    participations = ScheduleParticipant.objects.filter(schedule=OuterRef('pk')).filter(
+        Q(user=user) | Q(group_id__in=user_group_ids(user.pk))
+    )
+    return Q(creator=user) | Q(Exists(participations))
+
+
+def overlapping(queryset, start, end):
+    """Rows of ``queryset`` whose [start_time, end_time] intersects [start, end)."""
+    if uses_range_index():
+        return queryset.alias(period=Period('start_time', 'end_time')).filter(
+            period__overlap=DateTimeTZRange(start, end, '[)')
+        )
+    return queryset.filter(start_time__lt=end, end_time__gte=start)
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-19 11:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def clamp_inverted_periods(apps, schema_editor):
+    # Rows saved with end_time before start_time would fail the new check
+    # constraint and cannot form a range; treat them as zero-length events.
+    Schedule = apps.get_model('schedule', 'Schedule')
+    Schedule.objects.filter(end_time__lt=F('start_time')).update(end_time=F('start_time'))
+
+
+def create_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Must match schedule.calendar.Period for the planner to use it
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS schedule_schedule_period_gist "
+        "ON schedule_schedule USING gist (tstzrange(start_time, end_time, '[]'))"
+    )
+
+
+def drop_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS schedule_schedule_period_gist")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0002_alter_schedule_location'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(clamp_inverted_periods, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['start_time', 'end_time'], name='schedule_sc_start_t_f5c19e_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='schedule',
+            constraint=models.CheckConstraint(condition=models.Q(('end_time__gte', models.F('start_time'))), name='schedule_end_not_before_start'),
+        ),
+        migrations.RunPython(create_period_index, drop_period_index),
+    ]
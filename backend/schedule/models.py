@@ -20,6 +20,17 @@ class Schedule(models.Model):
 
     class Meta:
         ordering = ['start_time']
+        indexes = [
+            # Calendar window scans off Postgres (see schedule.calendar);
+            # Postgres also gets a GiST index on the period (migration 0003)
+            models.Index(fields=['start_time', 'end_time']),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_time__gte=models.F('start_time')),
+                name='schedule_end_not_before_start'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.start_time} - {self.end_time})"
@@ -34,6 +45,7 @@ class Schedule(models.Model):
             user=self.creator,
             activity_type=activity_type,
             details=f'Schedule "{self.title}" {"created" if is_new else "updated"}',
+            target=self,
             status='success'
         )
 
@@ -43,6 +55,8 @@ class Schedule(models.Model):
             user=self.creator,
             activity_type='schedule_deleted',
             details=f'Schedule "{self.title}" deleted',
+            target=self,
+            payload={'title': self.title},
             status='success'
         )
         super().delete(*args, **kwargs)
@@ -95,5 +109,7 @@ class ScheduleParticipant(models.Model):
                 user=self.user if self.user else None,
                 activity_type='schedule_response',
                 details=f'Responded "{self.response_status}" to schedule "{self.schedule.title}"',
+                target=self.schedule,
+                payload={'response_status': self.response_status},
                 status='success'
             )
\ No newline at end of file
@@ -1,12 +1,12 @@
 from rest_framework import serializers
 from .models import Schedule, ScheduleParticipant
-from users.serializers import UserSerializer
+from users.serializers import UserSummarySerializer
 from groups.serializers import GroupSerializer
 from groups.models import Group
 from users.models import User
 
 class ScheduleParticipantSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
     group = GroupSerializer(read_only=True)
     
     class Meta:
@@ -14,7 +14,7 @@ class ScheduleParticipantSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'group', 'is_optional', 'response_status']
 
 class ScheduleSerializer(serializers.ModelSerializer):
-    creator = UserSerializer(read_only=True)
+    creator = UserSummarySerializer(read_only=True)
     participants = ScheduleParticipantSerializer(many=True, read_only=True)
     participant_users = serializers.PrimaryKeyRelatedField(
         many=True,
@@ -38,6 +38,13 @@ class ScheduleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['creator', 'created_at', 'updated_at', 'participants']
 
+    def validate(self, attrs):
+        start = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        if start and end and end < start:
+            raise serializers.ValidationError({'end_time': 'End time cannot be before start time.'})
+        return attrs
+
     def create(self, validated_data):
         participant_users = validated_data.pop('participant_users', [])
         participant_groups = validated_data.pop('participant_groups', [])
@@ -98,4 +105,13 @@ class ScheduleSerializer(serializers.ModelSerializer):
                     group_id=group_id
                 )
         
-        return instance
\ No newline at end of file
+        return instance
+
+
+class CalendarEventSerializer(serializers.ModelSerializer):
+    """Compact event for calendar views; full details come from /schedules/<id>/."""
+
+    class Meta:
+        model = Schedule
+        fields = ['id', 'title', 'start_time', 'end_time', 'is_all_day', 'location', 'creator_id']
+        read_only_fields = fields
@@ -2,20 +2,46 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from datetime import datetime, timedelta
+
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from django.db.models import Prefetch, Q
 from groups.models import Group
+from groups.serializers import groups_with_member_counts
+from users.serializers import with_user_summaries
 from .models import Schedule, ScheduleParticipant
-from .serializers import ScheduleSerializer, ScheduleParticipantSerializer
+from .serializers import ScheduleSerializer, ScheduleParticipantSerializer, CalendarEventSerializer
+from .calendar import overlapping, participant_filter
 from users.models import UserActivity
+from metrics.counts import register_count, read_counts, wants_exact
+
+SCHEDULE_STAT_COUNTS = [
+    register_count('schedules.total', lambda: Schedule.objects.all()),
+]
+
+# Longest window /schedules/calendar/ serves in one request
+MAX_CALENDAR_WINDOW = timedelta(days=366)
 
 class ScheduleViewSet(viewsets.ModelViewSet):
     serializer_class = ScheduleSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Schedule.objects.all()
+        participants = with_user_summaries(ScheduleParticipant.objects.all(), 'user')
+        return with_user_summaries(self.visible_schedules(), 'creator').prefetch_related(
+            Prefetch('participants', queryset=participants),
+            Prefetch('participants__group', queryset=groups_with_member_counts()),
+        )
+
+    def visible_schedules(self):
+        """Staff see every schedule; everyone else the ones they created or take part in."""
+        user = self.request.user
+        if user.is_staff:
+            return Schedule.objects.all()
+        return Schedule.objects.filter(participant_filter(user))
 
         
     # def get_queryset(self):
@@ -62,6 +88,7 @@ class ScheduleViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             activity_type='schedule_created',
             details=f'{self.request.user} created schedule "{schedule.title}"',
+            target=schedule,
             status='success'
         )
     
@@ -87,6 +114,8 @@ class ScheduleViewSet(viewsets.ModelViewSet):
             user=request.user,
             activity_type='schedule_response',
             details=f'Responded "{response_status}" to schedule "{schedule.title}"',
+            target=schedule,
+            payload={'response_status': response_status},
             status='success'
         )
         
@@ -95,6 +124,43 @@ class ScheduleViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
     
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        The user's own events intersecting [from, to), compact and ordered
+        by start. ``from``/``to`` take a date (YYYY-MM-DD) or ISO datetime;
+        a bare ``to`` date includes that whole day.
+        """
+        start = self._parse_bound('from', request.query_params.get('from'))
+        end = self._parse_bound('to', request.query_params.get('to'), end_of_day=True)
+        if end <= start:
+            raise ValidationError({'to': 'Must be after from.'})
+        if end - start > MAX_CALENDAR_WINDOW:
+            raise ValidationError({'to': f'Window is limited to {MAX_CALENDAR_WINDOW.days} days.'})
+
+        queryset = overlapping(Schedule.objects.filter(participant_filter(request.user)), start, end)
+        queryset = queryset.only(*CalendarEventSerializer.Meta.fields).order_by('start_time', 'id')
+        return Response(CalendarEventSerializer(queryset, many=True).data)
+
+    @staticmethod
+    def _parse_bound(name, value, end_of_day=False):
+        if not value:
+            raise ValidationError({name: 'This parameter is required.'})
+        try:
+            # parse_datetime also accepts a bare date, so try the date form first
+            parsed = parse_date(value) or parse_datetime(value)
+        except ValueError:
+            # Well formed but impossible, e.g. 2024-13-45
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Enter a valid date (YYYY-MM-DD) or ISO datetime.'})
+        if not isinstance(parsed, datetime):
+            day = parsed + timedelta(days=1) if end_of_day else parsed
+            parsed = datetime.combine(day, datetime.min.time())
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         queryset = self.get_queryset().filter(
@@ -106,9 +172,9 @@ class ScheduleViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """General user statistics"""
-        total_schedule = Schedule.objects.count()
+        """General schedule statistics"""
+        counts = read_counts(SCHEDULE_STAT_COUNTS, exact=wants_exact(request))
         
         return Response({
-            'total_schedule': total_schedule,
+            'total_schedule': counts['schedules.total'],
         })
\ No newline at end of file
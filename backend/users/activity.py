@@ -0,0 +1,89 @@
+# users/activity.py
+"""
+Deferred activity logging for hot request paths.
+
+Instead of one INSERT per request, rows are queued in process and written
+by a background thread with bulk_create, at most every FLUSH_INTERVAL
+seconds or as soon as BATCH_SIZE rows are waiting. Rows still queued when
+the process exits are flushed by an atexit hook; a hard crash can lose up
+to one interval of entries, which is acceptable for the audit trail of
+logins but not for anything transactional. Timestamps are assigned when
+the batch is written, so they may trail the event by up to one interval.
+
+Set ACTIVITY_DEFERRED_WRITES = False to write synchronously (tests, shell).
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0  # seconds
+BATCH_SIZE = 200
+
+
+class ActivityWriter:
+    def __init__(self, interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._pending = deque()
+        self._wakeup = threading.Condition()
+        self._thread = None
+        self._flush_lock = threading.Lock()
+
+    def add(self, activity):
+        """Queue an unsaved UserActivity instance."""
+        if not getattr(settings, 'ACTIVITY_DEFERRED_WRITES', True):
+            activity.save()
+            return
+        with self._wakeup:
+            self._pending.append(activity)
+            self._ensure_thread()
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.notify()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                self._wakeup.wait_for(lambda: len(self._pending) >= self.batch_size, timeout=self.interval)
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far; returns the number of rows written."""
+        from .models import UserActivity
+
+        with self._flush_lock:
+            with self._wakeup:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+            close_old_connections()
+            try:
+                UserActivity.objects.bulk_create(batch, batch_size=self.batch_size)
+            except Exception:
+                logger.exception("Failed to write %s deferred activity rows", len(batch))
+                return 0
+            finally:
+                close_old_connections()
+            return len(batch)
+
+
+activity_writer = ActivityWriter()
+atexit.register(activity_writer.flush)
+
+
+def log_activity_deferred(**fields):
+    """UserActivity.objects.create(**fields), but batched off the request path."""
+    from .models import UserActivity
+
+    activity_writer.add(UserActivity(**fields))
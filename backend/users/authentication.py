@@ -0,0 +1,81 @@
+# users/authentication.py
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import SnapshotUser, User
+
+SNAPSHOT_TTL = 60  # seconds
+SNAPSHOT_FIELDS = ('id', 'email', 'role', 'status', 'is_staff', 'is_superuser', 'is_active')
+BLOCKED_STATUSES = ('suspended', 'deleted')
+
+
+def snapshot_cache_keys(user_id):
+    return f'users:snapshot:{user_id}', f'users:snapshot_version:{user_id}'
+
+
+def get_user_snapshot(user_id):
+    """
+    {field: value} for SNAPSHOT_FIELDS, from the cache when its version
+    stamp is current, otherwise from one narrow SELECT. None if the user
+    does not exist.
+
+    The version is read before the SELECT and stored with the snapshot,
+    so a save that commits while a reader is loading bumps the version and
+    the reader's (stale) copy is ignored on the next request. Keys live in
+    the shared cache (CACHES), so a bump reaches every worker.
+    """
+    data_key, version_key = snapshot_cache_keys(user_id)
+    cached = cache.get_many([data_key, version_key])
+    version = cached.get(version_key, 0)
+    snapshot = cached.get(data_key)
+    if snapshot is not None and snapshot['version'] == version:
+        return snapshot
+
+    snapshot = User.objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS).first()
+    if snapshot is None:
+        return None
+    snapshot['version'] = version
+    cache.set(data_key, snapshot, SNAPSHOT_TTL)
+    return snapshot
+
+
+def invalidate_user_snapshot(user_id):
+    _, version_key = snapshot_cache_keys(user_id)
+    cache.add(version_key, 0, None)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, 1, None)
+
+
+class SnapshotJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the per-request User SELECT: request.user is
+    a SnapshotUser carrying id, email, role, status and the staff flags
+    from the cached snapshot, and loads the rest of the row only if a
+    view reads another field. Suspended and deleted accounts are rejected
+    as soon as their snapshot is invalidated.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Needs the password hash, which the snapshot does not carry
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        snapshot = get_user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not snapshot['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if snapshot['status'] in BLOCKED_STATUSES:
+            raise AuthenticationFailed(_("Account suspended. Please contact admin."), code="user_suspended")
+
+        return SnapshotUser.from_snapshot(snapshot)
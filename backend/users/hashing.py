@@ -0,0 +1,154 @@
+# users/hashing.py
+"""
+Password hashing off the request worker.
+
+PBKDF2 is deliberately CPU-bound, so hashing and verification are sent to
+a bounded process pool (PASSWORD_HASH_WORKERS processes, with at most
+PASSWORD_HASH_MAX_PENDING jobs in flight before callers wait). Bulk
+imports hash many passwords in parallel and may use a cheaper cost
+(PASSWORD_BULK_HASH_ITERATIONS); those hashes, like any hash whose cost
+differs from PASSWORD_HASH_ITERATIONS, are upgraded on the next login.
+
+This module must not import models: pool workers load it with settings
+only, not the app registry.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher, check_password, get_hasher, identify_hasher, make_password,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_TIMEOUT = 30  # seconds
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    pbkdf2_sha256 with the work factor taken from PASSWORD_HASH_ITERATIONS.
+    Same algorithm name as Django's hasher, so existing hashes keep
+    verifying and are re-encoded when their iteration count differs.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+
+def _encode(password, iterations=None):
+    hasher = get_hasher('default')
+    if iterations and isinstance(hasher, PBKDF2PasswordHasher):
+        return hasher.encode(password, hasher.salt(), iterations)
+    return make_password(password)
+
+
+def _encode_many(passwords, iterations=None):
+    return [_encode(password, iterations) for password in passwords]
+
+
+def _verify(password, encoded):
+    """(matches, needs_rehash) without touching the database."""
+    if not check_password(password, encoded):
+        return False, False
+    # As django.contrib.auth.hashers.check_password: a hash from another
+    # algorithm (sha1, bcrypt, argon2...) always upgrades, and only hashes of
+    # the preferred algorithm are asked about their cost
+    preferred = get_hasher('default')
+    if identify_hasher(encoded).algorithm != preferred.algorithm:
+        return True, True
+    return True, preferred.must_update(encoded)
+
+
+class HashPool:
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = None
+
+    @property
+    def workers(self):
+        return getattr(settings, 'PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn: forking a threaded web worker is not safe
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'lms_admin.settings'),),
+                )
+                pending = getattr(settings, 'PASSWORD_HASH_MAX_PENDING', self.workers * 4)
+                self._slots = threading.BoundedSemaphore(pending)
+            return self._executor, self._slots
+
+    def run(self, fn, *args):
+        """Run fn(*args) in the pool; inline when the pool is disabled or broken."""
+        if self.workers <= 0:
+            return fn(*args)
+        executor, slots = self._get_executor()
+        timeout = getattr(settings, 'PASSWORD_HASH_TIMEOUT', DEFAULT_TIMEOUT)
+        with slots:
+            try:
+                return executor.submit(fn, *args).result(timeout=timeout)
+            except BrokenProcessPool:
+                logger.exception("Password hash pool broke; recreating it and hashing inline")
+                self.shutdown()
+                return fn(*args)
+
+    def map_chunks(self, fn, chunks, *args):
+        """fn(chunk, *args) for every chunk in parallel, results in order."""
+        if self.workers <= 0 or len(chunks) <= 1:
+            return [fn(chunk, *args) for chunk in chunks]
+        executor, _ = self._get_executor()
+        try:
+            return list(executor.map(fn, chunks, *[[arg] * len(chunks) for arg in args]))
+        except BrokenProcessPool:
+            logger.exception("Password hash pool broke during a bulk job; hashing inline")
+            self.shutdown()
+            return [fn(chunk, *args) for chunk in chunks]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+
+hash_pool = HashPool()
+
+
+def hash_password(password, iterations=None):
+    return hash_pool.run(_encode, password, iterations)
+
+
+def hash_passwords(passwords, iterations=None):
+    """Hash a list of passwords across all pool workers, preserving order."""
+    passwords = list(passwords)
+    if not passwords:
+        return []
+    if iterations is None:
+        iterations = getattr(settings, 'PASSWORD_BULK_HASH_ITERATIONS', None)
+    count = max(1, hash_pool.workers)
+    size = -(-len(passwords) // count)
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+    results = hash_pool.map_chunks(_encode_many, chunks, iterations)
+    return [encoded for chunk in results for encoded in chunk]
+
+
+def verify_password(password, encoded):
+    """Returns (matches, needs_rehash); rehash with hash_password() and store it."""
+    return hash_pool.run(_verify, password, encoded)
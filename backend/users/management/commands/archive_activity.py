@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from users.retention import apply_retention
+
+
+class Command(BaseCommand):
+    help = 'Archive and remove activity log rows past their retention period (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archive-dir', help='Override ACTIVITY_ARCHIVE_DIR')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would be archived without writing or deleting anything'
+        )
+
+    def handle(self, *args, **options):
+        result = apply_retention(directory=options['archive_dir'], dry_run=options['dry_run'])
+        for name in result['partitions']:
+            self.stdout.write(f'partition {name}: archived and dropped')
+        for activity_type, count in sorted(result['rows'].items()):
+            self.stdout.write(f'{activity_type}: {count} row(s)')
+        prefix = 'Would archive' if options['dry_run'] else 'Archived'
+        total = sum(result['rows'].values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {total} row(s) and {len(result['partitions'])} partition(s)"
+        ))
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.hashing import _encode, hash_passwords, hash_pool, verify_password
+
+
+class Command(BaseCommand):
+    help = 'Measure password hashing throughput at each PBKDF2 cost, inline and through the process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, nargs='+',
+            default=[100_000, 260_000, 600_000, 1_000_000],
+            help='PBKDF2 iteration counts to measure'
+        )
+        parser.add_argument('--count', type=int, default=40, help='Passwords hashed per measurement')
+        parser.add_argument('--workers', type=int, help='Override PASSWORD_HASH_WORKERS')
+
+    def handle(self, *args, **options):
+        if options['workers'] is not None:
+            settings.PASSWORD_HASH_WORKERS = options['workers']
+            hash_pool.shutdown()
+        count = options['count']
+        passwords = [f'benchmark-password-{i}' for i in range(count)]
+
+        # Start the workers before timing anything
+        hash_passwords(passwords[:max(1, hash_pool.workers)], iterations=1)
+
+        self.stdout.write(f'{count} passwords, {hash_pool.workers} pool worker(s)')
+        self.stdout.write(f"{'iterations':>12} {'inline/s':>10} {'pool/s':>10} {'ms/hash':>10} {'verify ms':>10}")
+        for iterations in options['iterations']:
+            started = time.perf_counter()
+            encoded = [_encode(password, iterations) for password in passwords]
+            inline = time.perf_counter() - started
+
+            started = time.perf_counter()
+            hash_passwords(passwords, iterations=iterations)
+            pooled = time.perf_counter() - started
+
+            started = time.perf_counter()
+            verify_password(passwords[0], encoded[0])
+            verify = time.perf_counter() - started
+
+            self.stdout.write(
+                f'{iterations:>12} {count / inline:>10.1f} {count / pooled:>10.1f} '
+                f'{inline / count * 1000:>10.1f} {verify * 1000:>10.1f}'
+            )
+        hash_pool.shutdown()
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from groups.models import Role
+from groups.registry import role_registry
+from users.models import User
+from users.permissions import has_perm
+
+
+class Command(BaseCommand):
+    help = 'Measure the per-check cost of has_perm against scanning and querying Role.permissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checks', type=int, default=200_000, help='Checks per in-memory measurement')
+        parser.add_argument('--queries', type=int, default=200, help='Checks for the per-request query baseline')
+        parser.add_argument('--role', help='Role code to check (default: the role with most permissions)')
+
+    def handle(self, *args, **options):
+        roles = role_registry.roles()
+        if not roles:
+            self.stderr.write('No roles defined')
+            return
+        code = options['role'] or max(roles.values(), key=lambda role: len(role.permissions or ())).code
+        role = roles.get(code)
+        if role is None:
+            self.stderr.write(f'Unknown role {code!r}')
+            return
+        granted = list(role.permissions or ()) or ['*']
+        # Worst case for the list scan: the last code, plus a miss
+        probes = [granted[-1], 'benchmark.not_granted']
+        user = User(email='benchmark@example.com', role=code)
+        checks = options['checks']
+
+        def per_check(fn, count):
+            started = time.perf_counter()
+            for i in range(count):
+                fn(probes[i & 1])
+            return (time.perf_counter() - started) / count
+
+        results = [
+            ('has_perm', per_check(lambda perm: has_perm(user, perm), checks)),
+            ('frozenset', per_check(lambda perm: perm in role.permission_set, checks)),
+            ('list scan', per_check(lambda perm: perm in role.permissions, checks)),
+            ('query', per_check(
+                lambda perm: perm in Role.objects.values_list('permissions', flat=True).get(code=code),
+                options['queries']
+            )),
+        ]
+
+        self.stdout.write(f'role {code!r}, {len(granted)} permission(s)')
+        self.stdout.write(f"{'check':>10} {'ns/check':>12}")
+        for label, seconds in results:
+            self.stdout.write(f'{label:>10} {seconds * 1e9:>12.0f}')
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_alter_useractivity_activity_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['-timestamp', '-id'], name='users_usera_timesta_7c9b4c_idx'),
+        ),
+    ]
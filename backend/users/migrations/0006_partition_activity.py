@@ -0,0 +1,18 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def partition_activity(apps, schema_editor):
+    from users.partitions import convert_to_partitioned
+    convert_to_partitioned(schema_editor, timezone.now().date())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('users', '0005_keyset_index'),
+    ]
+
+    operations = [
+        # Postgres only: monthly RANGE partitions on timestamp; no-op elsewhere
+        migrations.RunPython(partition_activity, migrations.RunPython.noop),
+    ]
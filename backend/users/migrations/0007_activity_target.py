@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-19 11:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+# Account events whose target is the user the row already points at
+USER_TARGET_TYPES = ['user_management', 'login', 'account_suspended', 'account_activated', 'profile_update']
+
+
+def backfill_user_targets(apps, schema_editor):
+    UserActivity = apps.get_model('users', 'UserActivity')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    rows = UserActivity.objects.filter(
+        activity_type__in=USER_TARGET_TYPES, user__isnull=False, content_type__isnull=True
+    )
+    if not rows.exists():
+        return
+    user_type, _ = ContentType.objects.get_or_create(app_label='users', model='user')
+    rows.update(content_type=user_type, object_id=Cast('user_id', models.CharField(max_length=64)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('users', '0006_partition_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useractivity',
+            name='content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='object_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['content_type', 'object_id', '-timestamp'], name='users_usera_content_d2e68e_idx'),
+        ),
+        migrations.RunPython(backfill_user_targets, migrations.RunPython.noop),
+    ]
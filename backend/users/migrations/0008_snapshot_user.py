@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 11:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_activity_target'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('users.user',),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -9,25 +11,32 @@ import uuid
 logger = logging.getLogger(__name__)
 
 class UserManager(BaseUserManager):
-    def create_user(self, email, password=None, **extra_fields):
+    def create_user(self, email, password=None, encoded_password=None, **extra_fields):
         if not email:
             raise ValueError('Users must have an email address')
         email = self.normalize_email(email)
         if 'role' not in extra_fields:
-            from groups.models import Role
-            default_role = Role.objects.filter(is_default=True).first()
+            from groups.registry import role_registry
+            default_role = role_registry.default_code()
             if default_role:
-                extra_fields['role'] = default_role.code
+                extra_fields['role'] = default_role
         user = self.model(email=email, **extra_fields)
-        if password:
+        if encoded_password:
+            # Already hashed by the caller (bulk import hashes in parallel)
+            user.password = encoded_password
+        elif password:
+            from .hashing import hash_password
             self.validate_password(password)
-            user.set_password(password)
+            user.password = hash_password(password)
+            user._password = password
         user.save(using=self._db)
         # Create activity log for user creation
         UserActivity.objects.create(
             user=user,
             activity_type='user_management',
             details=f'New user created with email: {email}',
+            target=user,
+            payload={'action': 'created'},
             status='success'
         )
         return user
@@ -47,6 +56,8 @@ class UserManager(BaseUserManager):
             user=user,
             activity_type='user_management',
             details=f'New superuser created with email: {email}',
+            target=user,
+            payload={'action': 'created', 'superuser': True},
             status='success'
         )
         return user
@@ -108,11 +119,8 @@ class User(AbstractUser):
         return self.first_name
 
     def get_role_display(self):
-        try:
-            from groups.models import Role
-            return Role.objects.get(code=self.role).name
-        except Role.DoesNotExist:
-            return self.role
+        from groups.registry import role_registry
+        return role_registry.display_name(self.role)
 
     def get_group(self):
         from groups.models import GroupMembership  # Import here to avoid circular import
@@ -150,6 +158,8 @@ class User(AbstractUser):
             user=self,
             activity_type='account_suspended',
             details=reason or 'Account suspended by admin',
+            target=self,
+            payload={'reason': reason},
             status='system'
         )
 
@@ -161,6 +171,7 @@ class User(AbstractUser):
             user=self,
             activity_type='account_activated',
             details='Account activated by admin',
+            target=self,
             status='success'
         )
 
@@ -173,6 +184,8 @@ class User(AbstractUser):
             user=self,
             activity_type='user_management',
             details=reason or 'Account deleted by admin',
+            target=self,
+            payload={'action': 'deleted', 'reason': reason},
             status='system'
         )
 
@@ -199,9 +212,47 @@ class User(AbstractUser):
                 user=self,
                 activity_type='profile_update',
                 details=f"Profile updated: {'; '.join(changes)}",
+                target=self,
+                payload={'changes': changes},
                 status='success'
             )
 
+class SnapshotUser(User):
+    """
+    A User built from the cached auth snapshot (users.authentication)
+    without a query. Only the snapshot columns are loaded; touching any
+    other field loads all remaining columns in one query, so views that
+    need the full profile still get it and the rest never pay for it.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        # from_db expects values in model field order
+        names = [field.attname for field in cls._meta.concrete_fields if field.attname in snapshot]
+        return cls.from_db('default', names, [snapshot[name] for name in names])
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
+class UserActivityQuerySet(models.QuerySet):
+    def for_object(self, obj):
+        """Activity recorded against ``obj`` (an indexed lookup on the target columns)."""
+        return self.filter(
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=str(obj.pk)
+        )
+
+    def for_model(self, model):
+        return self.filter(content_type=ContentType.objects.get_for_model(model))
+
+
 class UserActivity(models.Model):
 
     STATUS_CHOICES = (
@@ -228,6 +279,20 @@ class UserActivity(models.Model):
         choices=STATUS_CHOICES, 
         default='success'
     )
+    # What the activity was about; object_id is text so UUID keys fit too.
+    # Pass ``target=<instance>`` when logging.
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True
+    )
+    object_id = models.CharField(max_length=64, blank=True, null=True)
+    target = GenericForeignKey('content_type', 'object_id')
+    payload = models.JSONField(default=dict, blank=True)
+
+    objects = UserActivityQuerySet.as_manager()
 
     class Meta:
         verbose_name = _('Activity Log')
@@ -235,8 +300,10 @@ class UserActivity(models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['-timestamp']),
+            models.Index(fields=['-timestamp', '-id']),
             models.Index(fields=['user', 'activity_type']),
             models.Index(fields=['activity_type', 'status']),
+            models.Index(fields=['content_type', 'object_id', '-timestamp']),
         ]
 
     def __str__(self):
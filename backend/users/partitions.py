@@ -0,0 +1,200 @@
+# users/partitions.py
+"""
+Monthly range partitioning of the activity log on Postgres.
+
+users_useractivity is partitioned by RANGE (timestamp) with one child table
+per calendar month (users_useractivity_YYYY_MM) plus a DEFAULT partition
+that catches rows if maintenance falls behind; creating the missing month
+later moves those rows into it. Other backends keep a plain table; every
+helper here is a no-op there.
+"""
+import re
+from datetime import date
+
+from django.db import connection, transaction
+
+TABLE = 'users_useractivity'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_RE = re.compile(rf'^{TABLE}_(\d{{4}})_(\d{{2}})$')
+
+
+def supports_partitioning(conn=None):
+    return (conn or connection).vendor == 'postgresql'
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_{month:%Y_%m}'
+
+
+def is_partitioned(conn=None):
+    conn = conn or connection
+    if not supports_partitioning(conn):
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s",
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(conn=None):
+    """Monthly partitions as [(month_start, table_name)], oldest first."""
+    conn = conn or connection
+    if not is_partitioned(conn):
+        return []
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [TABLE]
+        )
+        partitions = []
+        for (name,) in cursor.fetchall():
+            match = PARTITION_RE.match(name)
+            if match:
+                partitions.append((date(int(match.group(1)), int(match.group(2)), 1), name))
+    return sorted(partitions)
+
+
+def _table_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [f'"{name}"'])
+    return cursor.fetchone()[0]
+
+
+def create_partition(month, cursor):
+    """
+    Create the partition for ``month``. Rows that already landed in the
+    DEFAULT partition for that month would make CREATE ... PARTITION OF
+    fail, so they are moved across with DEFAULT detached meanwhile.
+    """
+    name = partition_name(month)
+    bounds = [month.isoformat(), add_months(month, 1).isoformat()]
+    if _table_exists(cursor, name):
+        return
+    with transaction.atomic(using=cursor.db.alias):
+        strays = False
+        if _table_exists(cursor, DEFAULT_PARTITION):
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+                f'WHERE timestamp >= %s AND timestamp < %s)',
+                bounds
+            )
+            strays = cursor.fetchone()[0]
+        if not strays:
+            cursor.execute(
+                f'CREATE TABLE "{name}" PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)',
+                bounds
+            )
+            return
+        cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+        cursor.execute(
+            f'CREATE TABLE "{name}" PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)',
+            bounds
+        )
+        cursor.execute(
+            f'INSERT INTO "{name}" SELECT * FROM "{DEFAULT_PARTITION}" '
+            f'WHERE timestamp >= %s AND timestamp < %s',
+            bounds
+        )
+        cursor.execute(
+            f'DELETE FROM "{DEFAULT_PARTITION}" WHERE timestamp >= %s AND timestamp < %s',
+            bounds
+        )
+        cursor.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+
+
+def ensure_partitions(start, end, conn=None):
+    """Create monthly partitions covering [start, end]; returns the names created or kept."""
+    conn = conn or connection
+    if not is_partitioned(conn):
+        return []
+    names = []
+    month = month_start(start)
+    with conn.cursor() as cursor:
+        while month <= month_start(end):
+            create_partition(month, cursor)
+            names.append(partition_name(month))
+            month = add_months(month, 1)
+    return names
+
+
+def ensure_upcoming_partitions(today, months_ahead=3, conn=None):
+    return ensure_partitions(today, add_months(month_start(today), months_ahead), conn=conn)
+
+
+def drop_partition(name, conn=None):
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+        cursor.execute(f'DROP TABLE "{name}"')
+
+
+def convert_to_partitioned(schema_editor, today, months_ahead=3):
+    """
+    Swap the plain activity table for a partitioned one with the same
+    columns, defaults, indexes and id sequence, then copy the rows across.
+    Used by the users 0006 migration.
+    """
+    conn = schema_editor.connection
+    if not supports_partitioning(conn) or is_partitioned(conn):
+        return
+    legacy = f'{TABLE}_legacy'
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s "
+            "AND indexname NOT LIKE %s",
+            [TABLE, '%_pkey']
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM " + TABLE)
+        oldest, newest = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{legacy}"')
+        for name, _ in indexes:
+            cursor.execute(f'ALTER INDEX "{name}" RENAME TO "{name}_legacy"')
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{legacy}" RENAME CONSTRAINT "{name}" TO "{name}_legacy"')
+
+        # The partition key must be part of the primary key
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{legacy}" INCLUDING DEFAULTS, '
+            f'PRIMARY KEY (id, timestamp)) PARTITION BY RANGE (timestamp)'
+        )
+        cursor.execute(f'ALTER TABLE "{TABLE}" ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}')
+        # Indexes on the parent cascade to every current and future partition
+        for name, definition in indexes:
+            cursor.execute(definition)
+        cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{TABLE}" DEFAULT')
+
+    ensure_partitions(month_start(oldest or today), month_start(newest or today), conn=conn)
+    ensure_upcoming_partitions(today, months_ahead, conn=conn)
+
+    with conn.cursor() as cursor:
+        cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{legacy}"')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) "
+            f'FROM "{TABLE}"',
+            [TABLE]
+        )
+        cursor.execute(f'DROP TABLE "{legacy}"')
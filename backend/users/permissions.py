@@ -1,6 +1,39 @@
 # users/permissions.py
 from rest_framework.permissions import BasePermission
 
+from groups.registry import role_registry
+
+
+def has_perm(user, code):
+    """
+    Whether ``user``'s role grants permission ``code`` (an entry of
+    Role.permissions). Superusers hold every permission. The role's codes
+    come precompiled from the process-local role registry, so this costs a
+    dict and a frozenset lookup, never a query.
+    """
+    if user is None or not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+    return code in role_registry.permissions(user.role)
+
+
+class HasRolePermission(BasePermission):
+    """
+    Grants access when the user's role holds the view's ``required_permission``
+    (one code, or a dict of action -> code; actions missing from the dict
+    are allowed).
+    """
+
+    def has_permission(self, request, view):
+        required = getattr(view, 'required_permission', None)
+        if isinstance(required, dict):
+            required = required.get(getattr(view, 'action', None))
+        if required is None:
+            return bool(request.user and request.user.is_authenticated)
+        return has_perm(request.user, required)
+
+
 class IsOwnerUser(BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.role == 'owner'
@@ -0,0 +1,169 @@
+# users/retention.py
+"""
+Activity log retention and archival.
+
+ACTIVITY_RETENTION_DAYS maps activity_type to the number of days rows are
+kept, with 'default' covering every other type. Expired rows are streamed
+to gzip-compressed NDJSON files under ACTIVITY_ARCHIVE_DIR (one file per
+month) before they are removed. On Postgres, a monthly partition that has
+aged out for every activity type is archived and dropped whole; shorter
+per-type retention is enforced with chunked deletes.
+"""
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from . import partitions
+from .models import UserActivity
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 365
+CHUNK_SIZE = 5000
+ARCHIVE_FIELDS = (
+    'id', 'user_id', 'activity_type', 'details', 'ip_address',
+    'device_info', 'timestamp', 'status', 'content_type_id', 'object_id', 'payload',
+)
+
+
+def retention_policy():
+    policy = {'default': DEFAULT_RETENTION_DAYS}
+    policy.update(getattr(settings, 'ACTIVITY_RETENTION_DAYS', {}))
+    return policy
+
+
+def archive_dir():
+    return getattr(
+        settings, 'ACTIVITY_ARCHIVE_DIR',
+        os.path.join(settings.BASE_DIR, 'archives', 'activity')
+    )
+
+
+def cutoff_for(days, now=None):
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def _serialize(row):
+    return json.dumps(row, default=str, separators=(',', ':'))
+
+
+def stream_to_archive(queryset, label, directory=None):
+    """
+    Append the queryset's rows to <directory>/<label>.ndjson.gz without
+    loading them all at once. Each call adds a gzip member, which readers
+    such as zcat and gzip.open treat as one continuous stream.
+    Returns (path, rows_written).
+    """
+    directory = directory or archive_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{label}.ndjson.gz')
+    written = 0
+    with gzip.open(path, 'at', encoding='utf-8') as archive:
+        for row in queryset.values(*ARCHIVE_FIELDS).order_by('timestamp', 'id').iterator(chunk_size=CHUNK_SIZE):
+            archive.write(_serialize(row))
+            archive.write('\n')
+            written += 1
+    return path, written
+
+
+def _month_label(month):
+    return f'activity_{month:%Y_%m}'
+
+
+def _months_between(start, end):
+    month = partitions.month_start(start)
+    while month <= partitions.month_start(end):
+        yield month
+        month = partitions.add_months(month, 1)
+
+
+def _month_bounds(month):
+    # UTC, matching the partition bounds (Django runs Postgres sessions in UTC)
+    start = datetime.combine(month, time.min, tzinfo=dt_timezone.utc)
+    end = datetime.combine(partitions.add_months(month, 1), time.min, tzinfo=dt_timezone.utc)
+    return start, end
+
+
+def archive_and_delete(queryset, directory=None, dry_run=False):
+    """
+    Archive then delete the rows of ``queryset`` month by month, in chunks
+    of CHUNK_SIZE so no single transaction holds a long lock.
+    Returns the number of rows removed (or that would be, for dry runs).
+    """
+    bounds = queryset.aggregate(oldest=Min('timestamp'), newest=Max('timestamp'))
+    if bounds['oldest'] is None:
+        return 0
+    if dry_run:
+        return queryset.count()
+
+    removed = 0
+    for month in _months_between(
+        bounds['oldest'].astimezone(dt_timezone.utc), bounds['newest'].astimezone(dt_timezone.utc)
+    ):
+        start, end = _month_bounds(month)
+        month_rows = queryset.filter(timestamp__gte=start, timestamp__lt=end)
+        while True:
+            ids = list(month_rows.order_by('timestamp', 'id').values_list('id', flat=True)[:CHUNK_SIZE])
+            if not ids:
+                break
+            with transaction.atomic():
+                chunk = UserActivity.objects.filter(id__in=ids)
+                stream_to_archive(chunk, _month_label(month), directory)
+                removed += chunk.delete()[0]
+    return removed
+
+
+def drop_expired_partitions(now=None, directory=None, dry_run=False):
+    """
+    Archive and drop whole monthly partitions that ended before the longest
+    retention window. Returns the dropped table names.
+    """
+    if not partitions.is_partitioned():
+        return []
+    keep_from = cutoff_for(max(retention_policy().values()), now)
+    dropped = []
+    for month, name in partitions.list_partitions():
+        start, end = _month_bounds(month)
+        if end > keep_from:
+            continue
+        if not dry_run:
+            path, written = stream_to_archive(
+                UserActivity.objects.filter(timestamp__gte=start, timestamp__lt=end),
+                _month_label(month), directory
+            )
+            partitions.drop_partition(name)
+            logger.info("Archived %s rows from %s to %s and dropped it", written, name, path)
+        dropped.append(name)
+    return dropped
+
+
+def apply_retention(now=None, directory=None, dry_run=False):
+    """
+    Enforce the retention policy. Returns {'partitions': [...], 'rows': {activity_type: count}}.
+    """
+    now = now or timezone.now()
+    policy = retention_policy()
+    result = {'partitions': drop_expired_partitions(now, directory, dry_run), 'rows': {}}
+
+    explicit = [activity_type for activity_type in policy if activity_type != 'default']
+    for activity_type in explicit:
+        expired = UserActivity.objects.filter(
+            activity_type=activity_type, timestamp__lt=cutoff_for(policy[activity_type], now)
+        )
+        result['rows'][activity_type] = archive_and_delete(expired, directory, dry_run)
+
+    expired = UserActivity.objects.exclude(activity_type__in=explicit).filter(
+        timestamp__lt=cutoff_for(policy['default'], now)
+    )
+    result['rows']['default'] = archive_and_delete(expired, directory, dry_run)
+
+    if not dry_run:
+        partitions.ensure_upcoming_partitions(now.date())
+    return result
@@ -0,0 +1,154 @@
+# users/search.py
+from collections import defaultdict
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, CharField, F, FloatField, Func, IntegerField, Lookup, Q, Value, When
+from django.db.models.functions import Greatest
+
+SEARCH_FIELDS = ('name', 'email')
+AUTOCOMPLETE_FIELDS = ('id', 'email', 'first_name', 'last_name', 'role')
+AUTOCOMPLETE_LIMIT = 10
+# pg_trgm's default word_similarity_threshold, mirrored by the fallback
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+
+def uses_trigram_search():
+    return connection.vendor == 'postgresql'
+
+
+class FullName(Func):
+    """
+    first_name || ' ' || last_name, written exactly like the expression in
+    the users_user_full_name_trgm index so the planner can use it.
+    """
+    template = '(%(expressions)s)'
+    arg_joiner = " || ' ' || "
+    output_field = CharField()
+
+    def __init__(self):
+        super().__init__(F('first_name'), F('last_name'))
+
+
+class ILike(Lookup):
+    """Plain ILIKE; icontains wraps the column in UPPER() and misses trigram indexes."""
+    lookup_name = 'ilike'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', [*lhs_params, *rhs_params]
+
+
+def like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def trigrams(text):
+    """pg_trgm-style trigrams: per lower-cased word, padded with two leading and one trailing space."""
+    grams = set()
+    for word in ''.join(ch if ch.isalnum() else ' ' for ch in (text or '').lower()).split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NGramIndex:
+    """
+    In-memory trigram index used when the database has no pg_trgm (SQLite
+    test runs). Scores approximate word_similarity: the share of the
+    query's trigrams found in the field, with substring matches scoring 1.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.texts = {}
+
+    def add(self, doc_id, fields):
+        self.texts[doc_id] = {name: (text or '').lower() for name, text in fields.items()}
+        for text in fields.values():
+            for gram in trigrams(text):
+                self.postings[gram].add(doc_id)
+
+    def search(self, term):
+        """Return [(doc_id, score)] best first."""
+        needle = term.lower().strip()
+        query_grams = trigrams(needle)
+        if not needle:
+            return []
+        candidates = set()
+        for gram in query_grams:
+            candidates |= self.postings.get(gram, set())
+        candidates |= {doc_id for doc_id, fields in self.texts.items()
+                       if any(needle in text for text in fields.values())}
+
+        results = []
+        for doc_id in candidates:
+            fields = self.texts[doc_id]
+            if any(needle in text for text in fields.values()):
+                score = 1.0
+            else:
+                score = max(
+                    len(query_grams & trigrams(text)) / len(query_grams) if query_grams else 0.0
+                    for text in fields.values()
+                )
+            if score >= WORD_SIMILARITY_THRESHOLD:
+                results.append((doc_id, score))
+        return sorted(results, key=lambda item: (-item[1], item[0]))
+
+
+def _fallback_search(queryset, term, fields):
+    index = NGramIndex()
+    for pk, first_name, last_name, email in queryset.order_by().values_list(
+        'id', 'first_name', 'last_name', 'email'
+    ):
+        values = {}
+        if 'name' in fields:
+            values['name'] = f'{first_name} {last_name}'
+        if 'email' in fields:
+            values['email'] = email
+        index.add(pk, values)
+    ranked = [pk for pk, _ in index.search(term)]
+    if not ranked:
+        return queryset.none()
+    ordering = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked)],
+        output_field=IntegerField()
+    )
+    return queryset.filter(pk__in=ranked).annotate(search_position=ordering).order_by('search_position')
+
+
+def search_users(queryset, term, fields=SEARCH_FIELDS):
+    """
+    Rank ``queryset`` of users against ``term``. ``fields`` picks 'name'
+    (first and last name together) and/or 'email'.
+
+    On Postgres the match is ILIKE '%term%' plus word similarity (typo
+    tolerance) on the name, both served by the pg_trgm GIN indexes, and
+    results are ordered by trigram word similarity. Elsewhere an
+    in-memory n-gram index gives equivalent results.
+    """
+    term = (term or '').strip()
+    if not term:
+        return queryset
+    if not uses_trigram_search():
+        return _fallback_search(queryset, term, fields)
+
+    pattern = Value(like_pattern(term))
+    condition = Q()
+    scores = []
+    if 'name' in fields:
+        condition |= Q(ILike(FullName(), pattern)) | Q(TrigramWordSimilar(FullName(), Value(term)))
+        scores.append(TrigramWordSimilarity(Value(term), FullName()))
+    if 'email' in fields:
+        condition |= Q(ILike(F('email'), pattern))
+        scores.append(TrigramWordSimilarity(Value(term), 'email'))
+    rank = scores[0] if len(scores) == 1 else Greatest(*scores, output_field=FloatField())
+    return queryset.filter(condition).annotate(search_rank=rank).order_by('-search_rank', 'id')
+
+
+def autocomplete_users(queryset, term, limit=AUTOCOMPLETE_LIMIT):
+    """Top ``limit`` matches as small dicts (AUTOCOMPLETE_FIELDS only)."""
+    return list(search_users(queryset, term).values(*AUTOCOMPLETE_FIELDS)[:limit])
@@ -8,76 +8,157 @@ from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import exceptions
 from django.utils import timezone
+from django.db.models import F
+from rest_framework_simplejwt.settings import api_settings
+from datetime import timedelta
 from .models import User, UserActivity
+from .activity import log_activity_deferred
+from .hashing import hash_password, verify_password
+
+# last_login is only rewritten when it is at least this stale
+LAST_LOGIN_RESOLUTION = timedelta(minutes=1)
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login with a single user fetch. The password is checked against the
+    row loaded here rather than through authenticate() (which would load
+    it again), counters are written with one conditional UPDATE, and the
+    activity row is handed to the deferred writer.
+    """
+
+    def _client_info(self):
+        meta = self.context['request'].META
+        return meta.get('REMOTE_ADDR'), (meta.get('HTTP_USER_AGENT') or '')[:200] or None
+
+    def _fail(self):
+        raise exceptions.AuthenticationFailed(
+            self.error_messages['no_active_account'], 'no_active_account'
+        )
+
     def validate(self, attrs):
-        email = attrs.get('email')
+        email = attrs.get(self.username_field)
         password = attrs.get('password')
+        ip_address, device_info = self._client_info()
         user = User.objects.filter(email=email).first()
 
-        if user:
-            # Check if account is suspended due to too many failed attempts
-            if user.login_attempts >= 5 and user.status != 'suspended':
-                user.status = 'suspended'
-                user.save()
-                
-                # Log this activity
-                UserActivity.objects.create(
-                    user=user,
-                    activity_type='account_suspended',
-                    details='Account suspended due to too many failed login attempts',
-                    status='failed'
-                )
-            
-            if user.status == 'suspended':
-                raise exceptions.AuthenticationFailed(
-                    'Account suspended. Please contact admin.'
-                )
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            hash_password(password)
+            self._fail()
 
-        try:
-            data = super().validate(attrs)
-            
-            # Reset login attempts on successful login
-            if user and user.login_attempts > 0:
-                user.login_attempts = 0
-                user.last_login = timezone.now()
-                user.save()
-            
-            # Log successful login
-            UserActivity.objects.create(
-                user=self.user,
+        # Check if account is suspended due to too many failed attempts
+        if user.login_attempts >= 5 and user.status != 'suspended':
+            user.status = 'suspended'
+            user.save(update_fields=['status'])
+            log_activity_deferred(
+                user=user,
+                activity_type='account_suspended',
+                details='Account suspended due to too many failed login attempts',
+                target=user,
+                payload={'reason': 'login_attempts'},
+                status='failed'
+            )
+
+        if user.status == 'suspended':
+            raise exceptions.AuthenticationFailed(
+                'Account suspended. Please contact admin.'
+            )
+
+        matches, needs_rehash = verify_password(password, user.password)
+        if not matches or not api_settings.USER_AUTHENTICATION_RULE(user):
+            # Atomic increment; concurrent failures cannot lose a count
+            User.objects.filter(pk=user.pk).update(login_attempts=F('login_attempts') + 1)
+            user.login_attempts += 1
+            log_activity_deferred(
+                user=user,
                 activity_type='login',
-                details='Successful login',
-                ip_address=self.context['request'].META.get('REMOTE_ADDR'),
-                device_info=self.context['request'].META.get('HTTP_USER_AGENT'),
-                status='success'
+                details='Failed login attempt',
+                target=user,
+                payload={'attempts': user.login_attempts},
+                ip_address=ip_address,
+                device_info=device_info,
+                status='failed'
             )
-            
-            return data
-            
-        except exceptions.AuthenticationFailed:
-            # Increment failed login attempts
-            if user:
-                user.login_attempts += 1
-                user.save()
-                
-                # Log failed attempt
-                UserActivity.objects.create(
-                    user=user,
-                    activity_type='login',
-                    details='Failed login attempt',
-                    ip_address=self.context['request'].META.get('REMOTE_ADDR'),
-                    device_info=self.context['request'].META.get('HTTP_USER_AGENT'),
-                    status='failed'
+            if user.login_attempts >= 3:
+                raise exceptions.AuthenticationFailed(
+                    f'Invalid credentials. {5-user.login_attempts} attempts remaining before account suspension.'
                 )
-                
-                if user.login_attempts >= 3:
-                    raise exceptions.AuthenticationFailed(
-                        f'Invalid credentials. {5-user.login_attempts} attempts remaining before account suspension.'
-                    )
-            
-            raise
+            self._fail()
+
+        self.user = user
+        self._record_login(user, ip_address, device_info, password if needs_rehash else None)
+
+        refresh = self.get_token(user)
+        log_activity_deferred(
+            user=user,
+            activity_type='login',
+            details='Successful login',
+            target=user,
+            ip_address=ip_address,
+            device_info=device_info,
+            status='success'
+        )
+        return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+    def _record_login(self, user, ip_address, device_info, rehash_password=None):
+        """One UPDATE with only the columns that actually change, or none."""
+        now = timezone.now()
+        changes = {}
+        if rehash_password:
+            # Hash cost changed since this one was stored (e.g. bulk import)
+            changes['password'] = hash_password(rehash_password)
+        if user.login_attempts:
+            changes['login_attempts'] = 0
+        if user.last_login is None or now - user.last_login >= LAST_LOGIN_RESOLUTION:
+            changes['last_login'] = now
+        if ip_address and user.last_login_ip != ip_address:
+            changes['last_login_ip'] = ip_address
+        if device_info and user.last_login_device != device_info:
+            changes['last_login_device'] = device_info
+        if changes:
+            User.objects.filter(pk=user.pk).update(**changes)
+            for field, value in changes.items():
+                setattr(user, field, value)
+
+
+class LoginUserSerializer(serializers.ModelSerializer):
+    """The user fields the client needs right after login."""
+    role_display = serializers.CharField(source='get_role_display', read_only=True)
+
+    class Meta:
+        model = User
+        fields = [
+            'id', 'email', 'first_name', 'last_name', 'role', 'role_display',
+            'status', 'is_staff', 'is_superuser', 'profile_picture', 'last_login'
+        ]
+        read_only_fields = fields
+
+
+# Columns a nested user needs; load users with these and nothing else
+USER_SUMMARY_FIELDS = ('id', 'email', 'first_name', 'last_name', 'role', 'profile_picture')
+
+
+def with_user_summaries(queryset, *relations):
+    """
+    select_related(*relations) loading only the summary columns of each
+    joined user. Expressed as a defer of the other columns so the outer
+    model's own fields stay loaded (.only() would defer those too).
+    """
+    deferred = [field.name for field in User._meta.concrete_fields if field.attname not in USER_SUMMARY_FIELDS]
+    return queryset.select_related(*relations).defer(
+        *[f'{relation}__{name}' for relation in relations for name in deferred]
+    )
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact user for nesting inside other resources (no M2M, no profile text)."""
+    name = serializers.CharField(source='get_full_name', read_only=True)
+    avatar = serializers.ImageField(source='profile_picture', read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'first_name', 'last_name', 'name', 'role', 'avatar']
+        read_only_fields = fields
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -95,7 +176,7 @@ class UserSerializer(serializers.ModelSerializer):
     def validate_password(self, value):
         if len(value) < 8:
             raise serializers.ValidationError("Password must be at least 8 characters long")
-        return make_password(value)
+        return hash_password(value)
 
 class RoleStatsSerializer(serializers.Serializer):
     role = serializers.CharField()
@@ -0,0 +1,19 @@
+# users/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user_snapshot
+from .models import SnapshotUser, User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=SnapshotUser)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=SnapshotUser)
+def invalidate_auth_snapshot(sender, instance, **kwargs):
+    # Role, status and staff changes must reach the next request. Bump only
+    # once committed: an earlier bump lets a concurrent request cache the
+    # pre-commit row under the new version.
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user_snapshot(user_id))
@@ -4,14 +4,18 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import action
 from django.contrib.auth import get_user_model
 from .models import UserActivity, MagicToken
-from .serializers import UserSerializer, UserActivitySerializer, CustomTokenObtainPairSerializer
+from .serializers import UserSerializer, UserActivitySerializer, CustomTokenObtainPairSerializer, LoginUserSerializer
 import pandas as pd
 from django.db import transaction
 from django.db import models
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
 from django.conf import settings
 from datetime import datetime, timedelta
 from .models import MagicToken
+from .hashing import hash_passwords
+from .search import AUTOCOMPLETE_LIMIT, autocomplete_users, search_users
 import re
 import jwt
 from io import BytesIO
@@ -20,6 +24,7 @@ from datetime import datetime, timedelta
 from rest_framework.parsers import MultiPartParser, FormParser
 User = get_user_model()
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
 import logging
@@ -290,6 +295,8 @@ class UserViewSet(viewsets.ModelViewSet):
                                 user=user,
                                 activity_type='user_management',
                                 details=f'New user created with email: {user.email}',
+                                target=user,
+                                payload={'action': 'created', 'source': 'bulk_upload'},
                                 status='success'
                             ) for user in created_users
                         ])
@@ -386,6 +393,10 @@ from rest_framework.views import APIView
 import logging
 logger = logging.getLogger(__name__)
 from rest_framework.pagination import PageNumberPagination
+from lms_admin.pagination import KeysetPagination
+from metrics.counts import register_count, read_counts, wants_exact
+from django.core.cache import cache
+from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
@@ -402,14 +413,16 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
     
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        
-        # On successful login, add user data to response
-        if response.status_code == 200:
-            user = User.objects.get(email=request.data['email'])
-            response.data['user'] = UserSerializer(user).data
-            
-        return response
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        # The serializer already holds the authenticated user
+        data = dict(serializer.validated_data)
+        data['user'] = LoginUserSerializer(serializer.user, context={'request': request}).data
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -466,6 +479,19 @@ class CustomPagination(PageNumberPagination):
             'results': data
         })
 
+ROLE_STATS_CACHE_KEY = 'users:role_stats'
+ROLE_STATS_CACHE_TTL = 60
+SIGNUP_BUCKETS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+
+USER_STAT_COUNTS = [
+    register_count('users.total', lambda: User.objects.all()),
+    register_count('users.active', lambda: User.objects.filter(status='active')),
+    register_count('users.signups_30d', lambda: User.objects.filter(
+        signup_date__gte=timezone.now() - timedelta(days=30)
+    )),
+    register_count('users.suspicious', lambda: User.objects.filter(login_attempts__gt=3)),
+]
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -487,46 +513,55 @@ class UserViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(role=role)
         if status and status != 'all':
             queryset = queryset.filter(status=status)
-        if search:
-            queryset = queryset.filter(
-                models.Q(first_name__icontains=search) |
-                models.Q(last_name__icontains=search) |
-                models.Q(email__icontains=search)
-            )
         if date_from:
             queryset = queryset.filter(signup_date__gte=date_from)
         if date_to:
             queryset = queryset.filter(signup_date__lte=date_to)
+        if search:
+            # Trigram-indexed and ranked by relevance
+            return search_users(queryset, search)
             
         return queryset.order_by('-signup_date')
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Ranked user suggestions for pickers: ?q=<text>&limit=<n, max 20>."""
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response([])
+        try:
+            limit = min(int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)), 20)
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        return Response(autocomplete_users(User.objects.all(), term, limit=max(limit, 1)))
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """General user statistics"""
-        total_users = User.objects.count()
-        active_users = User.objects.filter(status='active').count()
-        
-        # Last 30 days signups
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        new_signups = User.objects.filter(signup_date__gte=thirty_days_ago).count()
-        
-        suspicious_activity = User.objects.filter(login_attempts__gt=3).count()
+        """General user statistics (snapshot counts, ?exact=true for live values)"""
+        counts = read_counts(USER_STAT_COUNTS, exact=wants_exact(request))
         
         return Response({
-            'total_users': total_users,
-            'active_users': active_users,
-            'new_signups': new_signups,
-            'suspicious_activity': suspicious_activity,
+            'total_users': counts['users.total'],
+            'active_users': counts['users.active'],
+            'new_signups': counts['users.signups_30d'],
+            'suspicious_activity': counts['users.suspicious'],
         })
     
     @action(detail=False, methods=['get'])
     def role_stats(self, request):
         """Detailed statistics by user role"""
-        roles = User.objects.values('role').annotate(
+        cached = cache.get(ROLE_STATS_CACHE_KEY)
+        if cached is not None:
+            return Response(cached)
+
+        # One grouped query with conditional aggregates for every breakdown
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        roles = User.objects.order_by().values('role').annotate(
             count=models.Count('id'),
             active_count=models.Count('id', filter=models.Q(status='active')),
             pending_count=models.Count('id', filter=models.Q(status='pending')),
-            suspended_count=models.Count('id', filter=models.Q(status='suspended'))
+            suspended_count=models.Count('id', filter=models.Q(status='suspended')),
+            recent_count=models.Count('id', filter=models.Q(signup_date__gte=thirty_days_ago))
         )
         
         # Convert to a more frontend-friendly format
@@ -537,10 +572,7 @@ class UserViewSet(viewsets.ModelViewSet):
                 'active': role['active_count'],
                 'pending': role['pending_count'],
                 'suspended': role['suspended_count'],
-                'last_30_days': User.objects.filter(
-                    role=role['role'],
-                    signup_date__gte=datetime.now() - timedelta(days=30)
-                ).count()
+                'last_30_days': role['recent_count']
             }
         
         # Include role descriptions and permissions
@@ -581,6 +613,48 @@ class UserViewSet(viewsets.ModelViewSet):
                 'permissions': info['permissions']
             })
         
+        cache.set(ROLE_STATS_CACHE_KEY, result, ROLE_STATS_CACHE_TTL)
+        return Response(result)
+
+    @action(detail=False, methods=['get'])
+    def role_signups(self, request):
+        """
+        Signups per role bucketed by day, week or month over the last N days,
+        e.g. ?days=30&bucket=day. One GROUP BY over truncated signup dates.
+        """
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket not in SIGNUP_BUCKETS:
+            return Response(
+                {'error': f'bucket must be one of {sorted(SIGNUP_BUCKETS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 366)
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_key = f'{ROLE_STATS_CACHE_KEY}:signups:{bucket}:{days}'
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
+
+        rows = User.objects.filter(
+            signup_date__gte=timezone.now() - timedelta(days=days)
+        ).annotate(
+            period=SIGNUP_BUCKETS[bucket]('signup_date')
+        ).order_by().values('period', 'role').annotate(
+            count=models.Count('id')
+        ).order_by('period', 'role')
+
+        series = defaultdict(dict)
+        for row in rows:
+            series[row['period'].date().isoformat()][row['role']] = row['count']
+        result = {
+            'bucket': bucket,
+            'days': days,
+            'series': [{'period': period, 'counts': counts} for period, counts in series.items()],
+        }
+        cache.set(cache_key, result, ROLE_STATS_CACHE_TTL)
         return Response(result)
 
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
@@ -621,12 +695,13 @@ class UserViewSet(viewsets.ModelViewSet):
                 # Process each row
                 created_users = []
                 errors = []
+                pending = []
                 
                 for index, row in df.iterrows():
                     try:
                         user_data = {
                             'email': row['email'],
-                            'password': row['password'],
+                            'password': str(row['password']),
                             'first_name': row['firstName'],
                             'last_name': row['lastName'],
                             'role': row['role'].lower(),
@@ -639,22 +714,27 @@ class UserViewSet(viewsets.ModelViewSet):
                             if field in row and pd.notna(row[field]):
                                 user_data[field] = row[field]
                         
-                        # Create user
-                        user = User.objects.create_user(**user_data)
+                        User.objects.validate_password(user_data['password'])
+                        pending.append((index, row, user_data))
+                    except Exception as e:
+                        errors.append({
+                            'row': index + 2,
+                            'error': str(e),
+                            'data': dict(row)
+                        })
+                
+                # Hash every password in parallel (bulk cost, upgraded on first login)
+                hashes = hash_passwords(user_data.pop('password') for _, _, user_data in pending)
+                
+                for (index, row, user_data), encoded in zip(pending, hashes):
+                    try:
+                        with transaction.atomic():
+                            user = User.objects.create_user(encoded_password=encoded, **user_data)
                         created_users.append({
                             'id': user.id,
                             'email': user.email,
                             'name': user.get_full_name()
                         })
-                        # Create activity feed entries
-                        UserActivity.objects.bulk_create([
-                            UserActivity(
-                                user=user,
-                                activity_type='user_management',
-                                details=f'New user created with email: {user.email}',
-                                status='success'
-                            ) for user in created_users
-                        ])
                     except Exception as e:
                         errors.append({
                             'row': index + 2,
@@ -662,6 +742,7 @@ class UserViewSet(viewsets.ModelViewSet):
                             'data': dict(row)
                         })
 
+                # create_user() already logged a 'created' activity per user
                 return Response({
                     'success': True,
                     'created_count': len(created_users),
@@ -692,19 +773,59 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = UserActivity.objects.all()
+    queryset = UserActivity.objects.select_related('user')
     serializer_class = UserActivitySerializer
     # permission_classes = [permissions.IsAdminUser]
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-timestamp', '-id')
     
     def get_queryset(self):
         queryset = super().get_queryset()
         user_id = self.request.query_params.get('user_id', None)
+        activity_type = self.request.query_params.get('activity_type', None)
+        date_from = self.request.query_params.get('date_from', None)
+        date_to = self.request.query_params.get('date_to', None)
         
         if user_id:
             queryset = queryset.filter(user_id=user_id)
+        if activity_type and activity_type != 'all':
+            queryset = queryset.filter(activity_type=activity_type)
+        # Plain range filters on timestamp let Postgres skip monthly partitions
+        # outside [date_from, date_to]; a bare date_to covers that whole day
+        if date_from:
+            bound = self._parse_bound('date_from', date_from)
+            if isinstance(bound, datetime):
+                queryset = queryset.filter(timestamp__gte=bound)
+            else:
+                queryset = queryset.filter(timestamp__gte=self._day_start(bound))
+        if date_to:
+            bound = self._parse_bound('date_to', date_to)
+            if isinstance(bound, datetime):
+                queryset = queryset.filter(timestamp__lte=bound)
+            else:
+                queryset = queryset.filter(timestamp__lt=self._day_start(bound + timedelta(days=1)))
             
         return queryset
+
+    @staticmethod
+    def _parse_bound(name, value):
+        """A date (YYYY-MM-DD) or an ISO datetime; anything else is a 400."""
+        try:
+            # parse_datetime also accepts a bare date, so try the date form first
+            parsed = parse_date(value) or parse_datetime(value)
+        except ValueError:
+            # Well formed but impossible, e.g. 2024-13-45
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Enter a valid date (YYYY-MM-DD) or ISO datetime.'})
+        if isinstance(parsed, datetime) and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    @staticmethod
+    def _day_start(day):
+        return timezone.make_aware(datetime.combine(day, datetime.min.time()))
     
 
 